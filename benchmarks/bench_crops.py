@@ -0,0 +1,87 @@
+"""作物逐日更新基准：全图扫描与稀疏作物索引的对比（1000x1000 地图，几百株作物）
+
+每轮先从快照恢复浇过水的地图（不计时），只给 update_day 本身计时。
+逐帧的浇水同步已经去掉（浇水/种植时直接写好），所以这里不再测 update()。
+
+用法: python benchmarks/bench_crops.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.config import Config
+from game.world import World
+from game.chunks import CHUNK_ARRAYS
+
+MAP_SIZE = 1000
+CROP_COUNT = 400
+DAYS = 20
+
+
+def update_day_full_scan(world):
+    """旧的逐日更新：扫描整张地图"""
+    grid = world.grid
+    codes = world.registry.codes
+    growing = grid.watered & grid.crop_watered
+    grid.crop_growth[growing] += 1
+    grid.crop_ready |= growing & (grid.crop_growth >= world.registry.crop_growth_time[grid.crop])
+    grid.crop_watered[growing] = False
+    grid.type[grid.watered & (grid.type == codes["watered_soil"])] = codes["tilled_soil"]
+    grid.watered[:] = False
+
+
+def plant_and_water(world, positions):
+    for x, y in positions:
+        world.grid.set_type(x, y, world.registry.codes["untilled_soil"])
+        world.till_soil(x, y)
+        world.plant_crop(x, y, "turnip")
+        world.water_soil(x, y)
+
+
+def snapshot(world):
+    return {name: getattr(world.grid, name).copy() for name in CHUNK_ARRAYS}, set(world.watered_tiles)
+
+
+def restore(world, saved):
+    arrays, watered_tiles = saved
+    for name, array in arrays.items():
+        getattr(world.grid, name)[...] = array
+    world.watered_tiles = set(watered_tiles)
+
+
+def timed_days(world, saved, update_day):
+    """每天开始前恢复快照，只累计 update_day 的耗时"""
+    total = 0.0
+    for _ in range(DAYS):
+        restore(world, saved)
+        start = time.perf_counter()
+        update_day(world)
+        total += time.perf_counter() - start
+    return total / DAYS * 1000
+
+
+def main():
+    config = Config()
+    config.map_width = MAP_SIZE
+    config.map_height = MAP_SIZE
+
+    start = time.perf_counter()
+    world = World(config)
+    print(f"generated {MAP_SIZE}x{MAP_SIZE} world in {time.perf_counter() - start:.2f}s")
+
+    rng = random.Random(0)
+    positions = {(rng.randrange(MAP_SIZE), rng.randrange(MAP_SIZE)) for _ in range(CROP_COUNT)}
+    plant_and_water(world, positions)
+    saved = snapshot(world)
+
+    print(f"{len(positions)} crops")
+    print(f"{'':>14} {'full scan':>10} {'index':>10}")
+    print(f"{'update_day ms':>14} {timed_days(world, saved, update_day_full_scan):>10.3f} "
+          f"{timed_days(world, saved, World.update_day):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""长距离寻路基准：整张地图上的平面 A* 与分层寻路（HPA*）的单次查询耗时对比（1000x1000 地图）
+
+HPA* 分别测：不预计算按需建扇区、预计算整张图的耗时、预计算后的第一次和再次查询
+
+用法: python benchmarks/bench_pathfinding.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.config import Config
+from game.world import World
+from game.pathfinding import SectorGraph, astar
+
+MAP_SIZE = 1000
+QUERIES = 10
+MIN_DISTANCE = 400  # 只测长路线
+
+
+def random_pairs(world, rng):
+    pairs = []
+    while len(pairs) < QUERIES:
+        a = (rng.randrange(world.width), rng.randrange(world.height))
+        b = (rng.randrange(world.width), rng.randrange(world.height))
+        if world.is_walkable(*a) and world.is_walkable(*b) and \
+                abs(a[0] - b[0]) + abs(a[1] - b[1]) >= MIN_DISTANCE:
+            pairs.append((a, b))
+    return pairs
+
+
+def timed(function, pairs):
+    start = time.perf_counter()
+    paths = [function(a, b) for a, b in pairs]
+    return (time.perf_counter() - start) / len(pairs) * 1000, paths
+
+
+def main():
+    config = Config()
+    config.map_width = MAP_SIZE
+    config.map_height = MAP_SIZE
+    world = World(config)
+    pairs = random_pairs(world, random.Random(0))
+
+    walkable = ((0, 0), world.grid.walkable.tolist())
+    flat, flat_paths = timed(lambda a, b: astar(*walkable, a, b), pairs)
+    lazy, _ = timed(SectorGraph(world, config.sector_size).find_path, pairs)  # 扇区按需建好（区块地图的做法）
+
+    start = time.perf_counter()
+    SectorGraph(world, config.sector_size).precompute()
+    precompute = time.perf_counter() - start
+
+    # World 建好时已经预计算过扇区
+    first, _ = timed(world.find_path, pairs)  # 扇区内的逐格小段还没缓存
+    warm, paths = timed(world.find_path, pairs)
+
+    # 改一格的通行性，只重建附近的扇区
+    x, y = pairs[0][0]
+    world.grid.set_type(x, y, world.registry.codes["rock"])
+    repaired, _ = timed(world.find_path, pairs[1:])
+
+    found = [(path, flat_path) for path, flat_path in zip(paths, flat_paths) if path and flat_path]
+    ratio = sum(len(path) for path, _ in found) / max(1, sum(len(flat_path) for _, flat_path in found))
+    print(f"{MAP_SIZE}x{MAP_SIZE} map, {QUERIES} routes of >= {MIN_DISTANCE} tiles")
+    print(f"  flat A*:             {flat:6.1f} ms/route")
+    print(f"  HPA* (lazy sectors): {lazy:6.1f} ms/route")
+    print(f"  HPA* (first query):  {first:6.1f} ms/route")
+    print(f"  HPA* (warm):         {warm:6.1f} ms/route  ({flat / warm:.1f}x, path length {ratio:.3f}x of optimal)")
+    print(f"  HPA* after repair:   {repaired:6.1f} ms/route")
+    print(f"  precompute all sectors: {precompute:.1f}s")
+
+if __name__ == "__main__":
+    main()
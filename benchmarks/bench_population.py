@@ -0,0 +1,55 @@
+"""猫咖基准：N 个 Cat 对象逐只 update 与 CatPopulation 数组批量更新的每步耗时对比
+
+用法: python benchmarks/bench_population.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.config import Config
+from game.world import World
+from game.player import Player
+from game.cat import Cat
+from game.population import CatPopulation
+
+COUNTS = [100, 1000, 5000]
+STEPS = 120
+
+
+def measure(update):
+    update()  # 预热
+    start = time.perf_counter()
+    for _ in range(STEPS):
+        update()
+    return (time.perf_counter() - start) / STEPS * 1000
+
+
+def main():
+    config = Config()
+    world = World(config)
+    player = Player(config, world)
+
+    print(f"{'cats':>6} {'Cat objects ms/step':>20} {'population ms/step':>19} {'speedup':>8}")
+    for count in COUNTS:
+        population = CatPopulation(config, player, count, seed=0)
+        cats = []
+        for index in range(count):
+            cat = Cat(config, player, population.clock, population.scheduler)
+            cat.x, cat.y = int(population.x[index]), int(population.y[index])
+            cat.hunger = 60  # 饿着的猫会去找水钓鱼，两边都走到完整的决策分支
+            cats.append(cat)
+        population.hunger[:] = 60
+
+        def update_objects():
+            for cat in cats:
+                cat.update(world, player)
+
+        before = measure(update_objects)
+        after = measure(lambda: population.update(world, player))
+        print(f"{count:>6} {before:>20.2f} {after:>19.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""世界渲染基准：逐瓦片 font.render 与离屏地形层（静止 / 每帧平移一格）的帧率对比
+
+用法: python benchmarks/bench_render.py
+"""
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+from game.config import Config
+from game.world import World, GLYPH_ARRAYS
+from game.player import Player
+from game.util import get_font
+
+VIEW_SIZES = [(20, 15), (40, 30), (80, 60)]
+FRAMES = 120
+
+
+def draw_with_font_render(world, screen, player):
+    """旧的绘制方式：每帧为每个瓦片调用 font.render"""
+    config = world.config
+    tile_size = config.tile_size
+    font = get_font(is_ascii=True, size=tile_size)
+    view_x_start = max(0, player.x - config.view_width // 2)
+    view_y_start = max(0, player.y - config.view_height // 2)
+    view_x_end = min(world.width, view_x_start + config.view_width)
+    view_y_end = min(world.height, view_y_start + config.view_height)
+    world.view_x_start = view_x_start
+    world.view_y_start = view_y_start
+    width = view_x_end - view_x_start
+    height = view_y_end - view_y_start
+    glyphs = world.registry.glyph_ids(
+        *(world.grid.window(name, view_x_start, view_y_start, width, height) for name in GLYPH_ARRAYS)
+    ).tolist()
+    for i, column in enumerate(glyphs):
+        for j, glyph in enumerate(column):
+            if view_x_start + i == player.x and view_y_start + j == player.y:
+                continue
+            symbol, color = world.registry.glyphs[glyph]
+            text_surface = font.render(symbol, True, color)
+            screen.blit(text_surface, (i * tile_size, j * tile_size))
+
+
+def measure(draw, screen, world, player, scroll=False):
+    draw(screen, player)  # 预热（字体、图集）
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        if scroll:
+            # 来回平移，镜头每帧移动一格
+            player.x += 1 if frame % 40 < 20 else -1
+        screen.fill((0, 0, 0))
+        draw(screen, player)
+        player.draw(screen)
+    return FRAMES / (time.perf_counter() - start)
+
+
+def main():
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+
+    print(f"{'view':>8} {'font.render fps':>16} {'static fps':>11} {'scroll fps':>11} {'speedup':>8}")
+    for view_width, view_height in VIEW_SIZES:
+        config = Config()
+        config.view_width = view_width
+        config.view_height = view_height
+        config.map_width = max(config.map_width, view_width * 2)
+        config.map_height = max(config.map_height, view_height * 2)
+
+        world = World(config)
+        player = Player(config, world)
+        player.x, player.y = world.width // 2, world.height // 2
+        screen = pygame.Surface((view_width * config.tile_size, view_height * config.tile_size))
+
+        before = measure(lambda s, p: draw_with_font_render(world, s, p), screen, world, player)
+        static = measure(world.draw, screen, world, player)
+        scrolling = measure(world.draw, screen, world, player, scroll=True)
+        print(f"{view_width:>3}x{view_height:<4} {before:>16.1f} {static:>11.1f} {scrolling:>11.1f} "
+              f"{static / before:>7.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""地图生成基准：逐格循环与整块数组运算的对比
+
+用法: python benchmarks/bench_worldgen.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.config import Config
+from game.grid import TileGrid
+from game.tiles import TileRegistry
+from game.worldgen import generate_region, region_rng, RIVER_X_RANGE, LAKES, FARMLAND_AREA
+
+MAP_SIZES = [250, 500, 1000, 2000]
+LOOP_MAX_SIZE = 1000  # 逐格循环太慢，只测到这个尺寸
+
+
+def generate_per_cell(grid, rng, home_position):
+    """旧的生成方式：逐格判断河流、湖泊并逐格掷随机数"""
+    for x in range(grid.width):
+        for y in range(grid.height):
+            tile_type = "grass"
+            if RIVER_X_RANGE[0] <= x <= RIVER_X_RANGE[1]:
+                tile_type = "water"
+            for lake_x, lake_y, radius in LAKES:
+                if (x - lake_x) ** 2 + (y - lake_y) ** 2 <= radius ** 2:
+                    tile_type = "water"
+                    break
+            if tile_type == "grass" and rng.random() < 0.05:
+                tile_type = "tree"
+            elif tile_type == "grass" and rng.random() < 0.03:
+                tile_type = "rock"
+            x_start, y_start, x_end, y_end = FARMLAND_AREA
+            if x_start <= x < x_end and y_start <= y < y_end:
+                if rng.random() < 0.7:
+                    tile_type = "untilled_soil"
+            grid.type[x, y] = grid.registry.codes[tile_type]
+
+
+def main():
+    registry = TileRegistry(Config())
+    home_position = (12, 12)
+
+    print(f"{'map':>10} {'per-cell s':>11} {'vectorized s':>13}")
+    for size in MAP_SIZES:
+        grid = TileGrid(registry, size, size)
+
+        before = "-"
+        if size <= LOOP_MAX_SIZE:
+            start = time.perf_counter()
+            generate_per_cell(grid, random.Random(0), home_position)
+            before = f"{time.perf_counter() - start:.3f}"
+
+        start = time.perf_counter()
+        generate_region(grid, region_rng(0), home_position)
+        after = time.perf_counter() - start
+        print(f"{size:>4}x{size:<5} {before:>11} {after:>13.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+_UNSET = object()
+
+
+class Binding:
+    """一个控件与一个数据源的绑定：数据源的值变了才更新控件"""
+
+    __slots__ = ("source", "apply", "value", "version")
+
+    def __init__(self, source, apply):
+        self.source = source  # 无参函数，返回要显示的值
+        self.apply = apply  # 把新值写到控件上，比如 label.set_text
+        self.value = _UNSET
+        self.version = 0  # 值每变一次加一
+
+    def refresh(self):
+        """重新取值，变了才写入控件；返回是否写入了"""
+        value = self.source()
+        if value == self.value:
+            return False
+        self.value = value
+        self.version += 1
+        self.apply(value)
+        return True
+
+
+class BindingSet:
+    """一组绑定，每帧统一刷新，并统计省掉了多少次多余的控件更新"""
+
+    def __init__(self):
+        self.bindings = []
+        self.updates = 0  # 累计真正写入控件的次数
+        self.skipped = 0  # 累计因为值没变而省掉的次数
+        self.frame_updates = 0  # 最近一次 refresh 写入的次数
+
+    def bind(self, source, apply):
+        binding = Binding(source, apply)
+        self.bindings.append(binding)
+        return binding
+
+    def bind_text(self, label, source):
+        """把 pygame_gui 的 UILabel 绑定到一个返回字符串的函数"""
+        return self.bind(source, label.set_text)
+
+    def refresh(self):
+        updates = sum(binding.refresh() for binding in self.bindings)
+        self.frame_updates = updates
+        self.updates += updates
+        self.skipped += len(self.bindings) - updates
+        return updates
+
+    def stats(self):
+        return {"updates": self.updates, "skipped": self.skipped, "frame_updates": self.frame_updates}
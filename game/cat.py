@@ -1,16 +1,23 @@
-import pygame
 import random
 import math
+from game.glyph_atlas import get_glyph_atlas
+from game.render import interpolate
+from game.clock import RealClock
+from game.scheduler import Scheduler
+from game.sampler import EventSampler
 
 class Cat:
-    def __init__(self, config, player):
+    def __init__(self, config, player, clock=None, scheduler=None):
         self.config = config
+        self.clock = clock or RealClock()
+        self.scheduler = scheduler or Scheduler(self.clock)  # 由游戏主循环每步 run_due
         self.player = player
         self.world = player.world  # Store reference to world from player
         
         # Position (initially near player)
         self.x = player.x + 1
         self.y = player.y + 1
+        self.prev_x, self.prev_y = self.x, self.y  # 上一个模拟步的位置，绘制时插值用
         
         # Visual representation
         self.symbol = config.ascii_tiles["cat"]
@@ -25,6 +32,7 @@ class Cat:
         # 对话状态
         self.last_dialog_time = 0
         self.dialog_mood = "normal"  # normal, happy, angry, sleepy
+        self.mood_timer = None  # 对话后情绪恢复正常的定时器
         
         # Movement variables
         self.follow_distance = config.cat_follow_distance
@@ -63,13 +71,14 @@ class Cat:
             "fish_helper": False,    # Improves fishing
             "intimidate": False      # Helps with enemies
         }
+        
+        # 低概率的逐帧随机事件：预先抽好下一次发生在第几步，平时只倒数
+        self.fishing_roll = EventSampler(0.1)  # 饿了时开始捕鱼
+        self.behavior_roll = EventSampler(0.01)  # 换一种行为
+        self.watering_roll = EventSampler(0.01)  # 技能：浇水
+        self.growth_boost_roll = EventSampler(0.01)  # 技能：促进生长
     
     def update(self, world, player):
-        # 更新对话情绪（随时间恢复正常）
-        current_time = pygame.time.get_ticks()
-        if current_time - self.last_dialog_time > 20000:  # 20秒后恢复正常情绪
-            self.dialog_mood = "normal"
-        
         # 如果被举起，直接跟随玩家位置
         if self.is_picked_up:
             return
@@ -98,7 +107,7 @@ class Cat:
             self.continue_fishing(world)
         elif self.fishing_cooldown > 0:
             self.fishing_cooldown -= 1
-        elif self.hunger > 50 and random.random() < 0.1:  # 10% chance to start fishing when hungry
+        elif self.hunger > 50 and self.fishing_roll.tick():  # 10% chance to start fishing when hungry
             self.try_start_fishing(world)
         elif self.current_behavior == "follow":
             self.follow_player(world)
@@ -123,9 +132,13 @@ class Cat:
         # Use skills if available
         self.use_skills(world, player)
     
+    def simulate_ticks(self, ticks):
+        """跳过 ticks 个模拟步（无头批量模式）：饥饿值线性增长到上限，好感度不随时间变化"""
+        self.hunger = min(self.config.cat_max_hunger, self.hunger + self.config.cat_hunger_rate * ticks)
+    
     def choose_behavior(self):
         # Chance to change behavior
-        if random.random() < 0.01:  # 1% chance each update
+        if self.behavior_roll.tick():  # 1% chance each update
             # Weighted behaviors based on hunger and affection
             behaviors = ["follow", "wander", "sit"]
             weights = [0.6, 0.3, 0.1]  # Default weights
@@ -147,6 +160,13 @@ class Cat:
     def follow_player(self, world):
         """跟随玩家"""
         if self.distance_to_player() > self.config.cat_follow_distance:
+            # 沿距离场绕开障碍走
+            step = world.follow_step(self.x, self.y, self.player.x, self.player.y)
+            if step:
+                self.x, self.y = step
+                return
+            
+            # 离得太远不在距离场里：直线靠近
             # Calculate direction to player
             dx = self.player.x - self.x
             dy = self.player.y - self.y
@@ -241,7 +261,7 @@ class Cat:
         # Use cat skills based on what's unlocked
         
         # Water nearby plants
-        if self.skills["watering"] and random.random() < 0.01:
+        if self.skills["watering"] and self.watering_roll.tick():
             # Water a random tile nearby
             for dx in range(-1, 2):
                 for dy in range(-1, 2):
@@ -249,7 +269,7 @@ class Cat:
                         world.water_soil(self.x + dx, self.y + dy)
         
         # Growth boost
-        if self.skills["growth_boost"] and random.random() < 0.01:
+        if self.skills["growth_boost"] and self.growth_boost_roll.tick():
             # Boost growth of crops nearby
             for dx in range(-2, 3):
                 for dy in range(-2, 3):
@@ -263,7 +283,7 @@ class Cat:
         if self.skills["fish_helper"] and player.fishing_active:
             player.fishing_success_chance += 0.2
     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         # 如果被玩家举起，不需要单独绘制
         if self.is_picked_up:
             return
@@ -272,18 +292,17 @@ class Cat:
         world_view_x = getattr(self.player.world, 'view_x_start', 0)
         world_view_y = getattr(self.player.world, 'view_y_start', 0)
         
-        # Calculate screen position
-        screen_x = (self.x - world_view_x) * self.config.tile_size
-        screen_y = (self.y - world_view_y) * self.config.tile_size
+        # Calculate screen position (interpolated between simulation steps)
+        screen_x = round((interpolate(self.prev_x, self.x, alpha) - self.player.world.view_x) * self.config.tile_size)
+        screen_y = round((interpolate(self.prev_y, self.y, alpha) - self.player.world.view_y) * self.config.tile_size)
         
         # Only draw if the cat is within the view
         view_width = self.config.view_width
         view_height = self.config.view_height
         if (0 <= self.x - world_view_x < view_width and 
             0 <= self.y - world_view_y < view_height):
-            # Create and render the cat character
-            from game.util import get_font
-            font = get_font(is_ascii=True, size=self.config.tile_size)
+            # 从字形图集中绘制猫咪
+            atlas = get_glyph_atlas(self.config)
             
             # 根据不同状态显示不同的符号和颜色
             symbol = self.symbol
@@ -298,11 +317,10 @@ class Cat:
                 symbol = "F"  # 钓鱼中的猫
             
             # 绘制猫咪
-            text_surface = font.render(symbol, True, color)
-            screen.blit(text_surface, (screen_x, screen_y))
+            drawn = atlas.blit(screen, symbol, color, (screen_x, screen_y))
             
             # 根据情绪显示不同的表情符号
-            current_time = pygame.time.get_ticks()
+            current_time = self.clock.get_ticks()
             if current_time - self.last_dialog_time < 5000:  # 5秒内显示情绪
                 mood_symbols = {
                     "happy": "♥",   # 爱心
@@ -319,25 +337,21 @@ class Cat:
                     "normal": (255, 255, 255)  # 白色
                 }.get(self.dialog_mood, (255, 255, 255))
                 
-                # 创建小一号的字体
-                small_font = get_font(is_ascii=True, size=int(self.config.tile_size * 0.7))
-                mood_surface = small_font.render(mood_symbol, True, mood_color)
+                # 使用小一号字体的图集
+                small_atlas = get_glyph_atlas(self.config, int(self.config.tile_size * 0.7))
                 
                 # 在猫咪头上方显示情绪符号
-                screen.blit(mood_surface, (screen_x + self.config.tile_size - 5, screen_y - 10))
+                drawn.union_ip(small_atlas.blit(screen, mood_symbol, mood_color,
+                                                (screen_x + self.config.tile_size - 5, screen_y - 10)))
+            
+            return drawn
     
     def try_start_fishing(self, world):
-        """尝试开始捕鱼"""
-        # 检查周围的水域
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                new_x, new_y = self.x + dx, self.y + dy
-                tile = world.get_tile(new_x, new_y)
-                if tile and tile.type == "water":
-                    # 找到水域，开始捕鱼
-                    self.is_fishing = True
-                    self.fishing_progress = 0
-                    return True
+        """尝试开始捕鱼：周围 3x3 有水就开始"""
+        if world.start_fishing(self.x, self.y):
+            self.is_fishing = True
+            self.fishing_progress = 0
+            return True
         return False
     
     def continue_fishing(self, world):
@@ -448,6 +462,16 @@ class Cat:
         
         # 随机移动
         if self.swim_time % 10 == 0:  # 每10帧移动一次
+            # 有距离场时沿着它朝最近的岸游
+            direction = self.world.direction_to_land(self.x, self.y)
+            if direction is not None:
+                self.x += direction[0]
+                self.y += direction[1]
+                tile = self.world.get_tile(self.x, self.y)
+                if tile and tile.type != "water":
+                    self.is_swimming = False
+                return
+            
             # 寻找最近的陆地
             found_land = False
             
@@ -487,13 +511,19 @@ class Cat:
                     self.x = new_x
                     self.y = new_y
     
+    def reset_mood(self):
+        self.dialog_mood = "normal"
+    
     def respond_to_dialog(self, text):
         """响应玩家的对话"""
         import pygame
         import time
         
-        # 记录对话时间
-        self.last_dialog_time = pygame.time.get_ticks()
+        # 记录对话时间，20秒后恢复正常情绪
+        self.last_dialog_time = self.clock.get_ticks()
+        if self.mood_timer:
+            self.mood_timer.cancel()
+        self.mood_timer = self.scheduler.call_at(self.last_dialog_time + 20000, self.reset_mood)
         
         # 转换为小写，便于匹配关键词
         text = text.lower()
@@ -546,7 +576,7 @@ class Cat:
             return random.choice(hunger_responses)
         
         # 如果被丢过，会表现出不满
-        if self.is_thrown or (self.throw_progress > 0 and pygame.time.get_ticks() - self.last_dialog_time < 10000):
+        if self.is_thrown or (self.throw_progress > 0 and self.clock.get_ticks() - self.last_dialog_time < 10000):
             return random.choice(["喵！！！(生气地瞪着你)", "MEOW!!! (glares at you angrily)"])
         
         # 如果在游泳，回应会不同
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import numpy as np
+from game.grid import TileGrid, TileView
+from game.worldgen import generate_region, region_rng
+
+# 换出到磁盘时保存的数组
+CHUNK_ARRAYS = ("type", "tilled", "watered", "forage", "crop", "crop_growth", "crop_watered", "crop_ready")
+
+
+class ChunkedTileGrid:
+    """按区块懒加载的地图存储，接口与 TileGrid 相同（坐标都是世界坐标）
+
+    区块在第一次被访问时用确定的种子生成；离焦点（玩家）太远的区块会被换出：
+    没改动过的直接丢弃（随时可以重新生成），改动过的压缩保存到磁盘。
+    种着作物的区块不会被换出，保证作物每天照常生长。
+    """
+
+    def __init__(self, registry, config, width, height, seed, home_position):
+        self.registry = registry
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.home_position = home_position
+        self.chunk_size = config.chunk_size
+        self.keep_radius = config.chunk_keep_radius
+        self.cache_dir = config.chunk_cache_dir
+
+        self.chunks = {}  # (cx, cy) -> TileGrid
+        self.walkability_listeners = []  # 所有区块共用同一个监听者列表
+        self.type_listeners = []  # 瓦片类型变化的监听者，同样共用
+        self.saved_chunks = set()  # 已经写入磁盘的区块
+        self.focus_chunk = self.chunk_coords(*home_position)
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def chunk_coords(self, x, y):
+        return x // self.chunk_size, y // self.chunk_size
+
+    def chunk(self, cx, cy):
+        """获取区块，不在内存中时从磁盘读取或重新生成"""
+        chunk = self.chunks.get((cx, cy))
+        if chunk is None:
+            chunk = self.load_chunk(cx, cy)
+            self.chunks[(cx, cy)] = chunk
+        return chunk
+
+    def locate(self, x, y):
+        """世界坐标 -> (区块, 块内下标)"""
+        chunk = self.chunk(x // self.chunk_size, y // self.chunk_size)
+        return chunk, x - chunk.origin_x, y - chunk.origin_y
+
+    def view(self, x, y):
+        chunk, i, j = self.locate(x, y)
+        return TileView(chunk, i, j)
+
+    def window(self, name, x, y, width, height):
+        """把跨越多个区块的矩形拼成一个数组（矩形必须在地图内）"""
+        result = None
+        for cx in range(x // self.chunk_size, (x + width - 1) // self.chunk_size + 1):
+            for cy in range(y // self.chunk_size, (y + height - 1) // self.chunk_size + 1):
+                chunk = self.chunk(cx, cy)
+                array = getattr(chunk, name)
+                if result is None:
+                    result = np.empty((width, height), dtype=array.dtype)
+                # 区块与矩形的交集（世界坐标）
+                x0, x1 = max(x, chunk.origin_x), min(x + width, chunk.origin_x + chunk.width)
+                y0, y1 = max(y, chunk.origin_y), min(y + height, chunk.origin_y + chunk.height)
+                result[x0 - x:x1 - x, y0 - y:y1 - y] = array[x0 - chunk.origin_x:x1 - chunk.origin_x,
+                                                             y0 - chunk.origin_y:y1 - chunk.origin_y]
+        return result
+
+    def random_position(self, rng):
+        """在已加载的区块中随机取一个位置，避免为了随机采样去生成远处的区块"""
+        if not self.chunks:
+            self.chunk(*self.focus_chunk)
+        chunk = self.chunks[rng.choice(list(self.chunks))]
+        return (chunk.origin_x + rng.randrange(chunk.width),
+                chunk.origin_y + rng.randrange(chunk.height))
+
+    def plant_crop(self, x, y, crop_type):
+        chunk, i, j = self.locate(x, y)
+        chunk.plant_crop(i, j, crop_type)
+
+    def clear_crop(self, x, y):
+        chunk, i, j = self.locate(x, y)
+        chunk.clear_crop(i, j)
+
+    def nbytes(self):
+        """内存中区块占用的字节数"""
+        return sum(chunk.nbytes() for chunk in self.chunks.values())
+
+    def set_focus(self, x, y):
+        """更新焦点位置，焦点所在区块变化时换出远处的区块"""
+        focus_chunk = self.chunk_coords(x, y)
+        if focus_chunk == self.focus_chunk:
+            return
+        self.focus_chunk = focus_chunk
+
+        focus_cx, focus_cy = focus_chunk
+        for (cx, cy), chunk in list(self.chunks.items()):
+            if max(abs(cx - focus_cx), abs(cy - focus_cy)) <= self.keep_radius:
+                continue
+            if chunk.crop.any():
+                continue
+            self.evict_chunk(cx, cy)
+
+    def evict_chunk(self, cx, cy):
+        chunk = self.chunks.pop((cx, cy))
+        if chunk.dirty:
+            np.savez_compressed(self.chunk_path(cx, cy),
+                                **{name: getattr(chunk, name) for name in CHUNK_ARRAYS})
+            self.saved_chunks.add((cx, cy))
+
+    def load_chunk(self, cx, cy):
+        origin_x = cx * self.chunk_size
+        origin_y = cy * self.chunk_size
+        chunk = TileGrid(self.registry,
+                         min(self.chunk_size, self.width - origin_x),
+                         min(self.chunk_size, self.height - origin_y),
+                         origin_x, origin_y)
+
+        if (cx, cy) in self.saved_chunks:
+            with np.load(self.chunk_path(cx, cy)) as data:
+                for name in CHUNK_ARRAYS:
+                    getattr(chunk, name)[...] = data[name]
+            chunk.refresh_walkable()
+            chunk.dirty = True  # 磁盘上的版本和重新生成的不同，下次换出还要保存
+        else:
+            # 每个区块有自己的种子，生成结果与访问顺序无关
+            generate_region(chunk, region_rng(self.seed, cx, cy), self.home_position)
+        chunk.walkability_listeners = self.walkability_listeners
+        chunk.type_listeners = self.type_listeners
+        return chunk
+
+    def chunk_path(self, cx, cy):
+        if self.cache_dir is None:
+            self.cache_dir = tempfile.mkdtemp(prefix="pawparty_chunks_")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return os.path.join(self.cache_dir, f"{self.seed}_{cx}_{cy}.npz")
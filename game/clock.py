@@ -0,0 +1,72 @@
+import pygame
+
+
+class RealClock:
+    """真实时钟：游戏运行了多少毫秒（pygame.time.get_ticks）"""
+
+    def get_ticks(self):
+        return pygame.time.get_ticks()
+
+
+class ManualClock:
+    """手动时钟：只有调用 advance 时才走，不需要显示器，无头模拟和基准测试用"""
+
+    def __init__(self, start=0):
+        self.ticks = start
+
+    def get_ticks(self):
+        return int(self.ticks)
+
+    def advance(self, milliseconds):
+        self.ticks += milliseconds
+
+
+class ScaledClock:
+    """可以快进和暂停的时钟：在源时钟（默认真实时钟）上按倍率走
+
+    改倍率或暂停时先把当前读数记下来，所以读数永远是连续的，不会跳变。
+    """
+
+    def __init__(self, source=None, scale=1.0):
+        self.source = source or RealClock()
+        self.scale = scale
+        self.paused = False
+        self.base = 0.0  # 上次重新锚定时本时钟的读数
+        self.anchor = self.source.get_ticks()  # 那一刻源时钟的读数
+
+    @property
+    def rate(self):
+        """本时钟相对源时钟的实际速度（暂停时为0）"""
+        return 0.0 if self.paused else self.scale
+
+    def get_ticks(self):
+        return int(self._now())
+
+    def set_scale(self, scale):
+        self._rebase()
+        self.scale = scale
+
+    def pause(self):
+        if not self.paused:
+            self._rebase()
+            self.paused = True
+
+    def resume(self):
+        if self.paused:
+            self.anchor = self.source.get_ticks()
+            self.paused = False
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def _now(self):
+        if self.paused:
+            return self.base
+        return self.base + (self.source.get_ticks() - self.anchor) * self.scale
+
+    def _rebase(self):
+        self.base = self._now()
+        self.anchor = self.source.get_ticks()
@@ -4,6 +4,13 @@ class Config:
         self.screen_width = 800
         self.screen_height = 600
         self.tile_size = 24  # Size of ASCII tiles
+        self.max_fps = 60  # 渲染帧率上限（0 = 不限）
+        self.sim_rate = 60  # 模拟固定步长：每秒更新次数，与渲染帧率无关
+        self.max_frame_time = 0.25  # 单帧最多追赶的模拟时间（秒），卡顿时避免越追越慢
+        self.clock_scale = 1.0  # 游戏时钟相对真实时间的倍率
+        self.fast_forward_scale = 4.0  # 快进（F 键）时的倍率
+        self.dirty_rects = False  # 只把变化过的区域推到屏幕（display.update），慢速软件渲染时打开
+        self.show_dirty_rects = False  # 诊断叠加层：描出每帧推送的区域（游戏中按 F3 切换）
         
         # Font cache
         self.ascii_font = None  # 将用于缓存ASCII字体
@@ -13,6 +20,13 @@ class Config:
         self.map_height = 40
         self.view_width = 20  # How many tiles to show horizontally
         self.view_height = 15  # How many tiles to show vertically
+        self.world_seed = None  # None = 每次随机生成
+        
+        # Chunked world settings (for very large maps)
+        self.chunked_world = False  # 按区块懒加载地图，远处的区块换出到磁盘
+        self.chunk_size = 32
+        self.chunk_keep_radius = 3  # 距离玩家超过这么多个区块时换出
+        self.chunk_cache_dir = None  # None = 使用临时目录
         
         # Player settings
         self.max_energy = 100
@@ -38,6 +52,12 @@ class Config:
         self.cat_max_hunger = 100
         self.cat_hunger_rate = 0.02  # 降低猫的饥饿增长速度
         self.cat_fishing_chance = 0.4  # 猫捕鱼的成功率
+        self.cafe_cats = 0  # 猫咖模式：额外放出的猫的数量（按数组批量更新）
+        self.spatial_cell_size = 8  # 实体空间哈希的桶大小（格）
+        self.flow_field_radius = 32  # 跟随距离场覆盖玩家周围多少格
+        self.sector_size = 16  # 分层寻路的扇区边长（格）
+        self.auto_walk_interval = 6  # 点击移动时每走一格间隔的模拟步数
+        self.route_cache_size = 32  # 缓存多少条常用路线
         
         # Farm settings
         self.crop_types = {
@@ -86,6 +106,8 @@ class Config:
                 "season": "summer"
             }
         }
+        self.fish_per_tile = 0.5  # 每格水面能养几条（每种鱼），再乘上水体的随机丰度
+        self.fish_regen_rate = 0.2  # 每天补回被钓走的鱼的比例
         
         # Foraging items
         self.forage_types = {
@@ -141,4 +163,18 @@ class Config:
             "energy": (255, 215, 0),    # Gold
             "time": (135, 206, 250),    # Light blue
             "fish_spot": (0, 191, 255)  # Deep sky blue
+        }
+        
+        # Tile types - 新增地形只需在这里加一项（符号取 ascii_tiles 中的同名项）
+        # 第一项是默认地形；color 是 colors 中的键；walkable 可通行；
+        # soil 是农田土壤
+        self.tile_types = {
+            "grass": {"color": "grass", "walkable": True, "soil": False},
+            "water": {"color": "water", "walkable": False, "soil": False},
+            "untilled_soil": {"color": "soil", "walkable": True, "soil": True},
+            "tilled_soil": {"color": "soil", "walkable": True, "soil": True},
+            "watered_soil": {"color": "soil", "walkable": True, "soil": True},
+            "tree": {"color": "tree", "walkable": False, "soil": False},
+            "rock": {"color": "rock", "walkable": False, "soil": False},
+            "house": {"color": "house", "walkable": True, "soil": False}
         } 
\ No newline at end of file
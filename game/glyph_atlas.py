@@ -0,0 +1,77 @@
+import pygame
+from game.util import get_font
+
+
+class GlyphAtlas:
+    """把 (符号, 颜色) 组合预渲染到同一张图集上，绘制时只做子区域 blit"""
+
+    def __init__(self, font, width=512):
+        self.font = font
+        self.width = width
+        self.surface = pygame.Surface((width, font.get_linesize() * 4), pygame.SRCALPHA)
+        self.rects = {}  # (symbol, color) -> 图集中的子区域
+
+        # 简单的行式装箱：按行从左到右摆放字形
+        self.cursor_x = 0
+        self.cursor_y = 0
+        self.row_height = 0
+
+    def prerender(self, symbols, colors):
+        """一次性渲染所有符号与颜色的组合"""
+        for symbol in symbols:
+            for color in colors:
+                self.get_rect(symbol, color)
+
+    def get_rect(self, symbol, color):
+        """返回字形在图集中的区域，没有缓存时才渲染"""
+        key = (symbol, tuple(color))
+        rect = self.rects.get(key)
+        if rect is None:
+            rect = self._add_glyph(symbol, key[1])
+            self.rects[key] = rect
+        return rect
+
+    def blit(self, screen, symbol, color, pos):
+        """绘制单个字形，返回屏幕上被画到的区域"""
+        return screen.blit(self.surface, pos, self.get_rect(symbol, color))
+
+    def _add_glyph(self, symbol, color):
+        glyph = self.font.render(symbol, True, color)
+        glyph_w, glyph_h = glyph.get_size()
+
+        # 当前行放不下就换行
+        if self.cursor_x + glyph_w > self.width:
+            self.cursor_x = 0
+            self.cursor_y += self.row_height
+            self.row_height = 0
+
+        # 图集高度不够就扩大一倍
+        if self.cursor_y + glyph_h > self.surface.get_height():
+            new_height = max(self.surface.get_height() * 2, self.cursor_y + glyph_h)
+            grown = pygame.Surface((self.width, new_height), pygame.SRCALPHA)
+            grown.blit(self.surface, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            self.surface = grown
+
+        rect = pygame.Rect(self.cursor_x, self.cursor_y, glyph_w, glyph_h)
+        # 目标区域是全透明的，用MAX混合等于原样拷贝（包括alpha通道）
+        self.surface.blit(glyph, rect.topleft, special_flags=pygame.BLEND_RGBA_MAX)
+
+        self.cursor_x += glyph_w
+        self.row_height = max(self.row_height, glyph_h)
+        return rect
+
+
+# 创建图集缓存字典
+atlas_cache = {}
+
+def get_glyph_atlas(config, size=None):
+    """获取指定字号的字形图集，首次创建时预渲染配置中的全部符号和颜色"""
+    if size is None:
+        size = config.tile_size
+
+    if size not in atlas_cache:
+        atlas = GlyphAtlas(get_font(is_ascii=True, size=size))
+        atlas.prerender(config.ascii_tiles.values(), config.colors.values())
+        atlas_cache[size] = atlas
+
+    return atlas_cache[size]
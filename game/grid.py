@@ -0,0 +1,210 @@
+import numpy as np
+from game.tiles import NO_CROP, NO_FORAGE
+
+
+class TileGrid:
+    """以结构化数组（struct of arrays）保存一块矩形区域的瓦片数据，按 [x, y] 索引
+
+    origin_x/origin_y 是这块区域左上角的世界坐标，整张地图时为 (0, 0)。
+    除 locate 以外的方法都使用块内下标，整张地图时与世界坐标相同。
+    """
+
+    def __init__(self, registry, width, height, origin_x=0, origin_y=0):
+        self.registry = registry
+        self.width = width
+        self.height = height
+        self.origin_x = origin_x
+        self.origin_y = origin_y
+        self.dirty = False  # 生成之后是否被修改过
+        self.walkability_listeners = []  # 某格通行性变化时回调 listener(x, y)，坐标为世界坐标
+        self.type_listeners = []  # 某格瓦片类型变化时回调 listener(x, y)，同样是世界坐标
+
+        shape = (width, height)
+        self.type = np.zeros(shape, dtype=np.uint8)
+        self.tilled = np.zeros(shape, dtype=bool)
+        self.watered = np.zeros(shape, dtype=bool)
+        self.forage = np.zeros(shape, dtype=np.uint8)
+        self.crop = np.zeros(shape, dtype=np.uint8)
+        self.crop_growth = np.zeros(shape, dtype=np.float32)  # 已生长天数
+        self.crop_watered = np.zeros(shape, dtype=bool)       # 作物今天是否浇过水
+        self.crop_ready = np.zeros(shape, dtype=bool)
+        self.walkable = np.zeros(shape, dtype=bool)  # 通行位图，随 type 增量维护
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def locate(self, x, y):
+        """世界坐标 -> (存储块, 块内下标)，与 ChunkedTileGrid 接口一致"""
+        return self, x - self.origin_x, y - self.origin_y
+
+    def view(self, x, y):
+        return TileView(self, x, y)
+
+    def window(self, name, x, y, width, height):
+        """取出某个数组在世界坐标矩形内的部分（矩形必须在区域内）"""
+        i, j = x - self.origin_x, y - self.origin_y
+        return getattr(self, name)[i:i + width, j:j + height]
+
+    def refresh_walkable(self):
+        """整块重建通行位图（生成或读盘之后调用）"""
+        np.take(self.registry.walkable, self.type, out=self.walkable)
+
+    def set_type(self, x, y, code):
+        """修改瓦片类型，同时维护通行位图并通知监听者"""
+        self.dirty = True
+        changed = self.type[x, y] != code
+        self.type[x, y] = code
+        if changed:
+            for listener in self.type_listeners:
+                listener(self.origin_x + x, self.origin_y + y)
+        walkable = self.registry.walkable[code]
+        if self.walkable[x, y] != walkable:
+            self.walkable[x, y] = walkable
+            for listener in self.walkability_listeners:
+                listener(self.origin_x + x, self.origin_y + y)
+
+    def random_position(self, rng):
+        return rng.randrange(self.width), rng.randrange(self.height)
+
+    def plant_crop(self, x, y, crop_type):
+        self.dirty = True
+        self.crop[x, y] = self.registry.crop_codes[crop_type]
+        self.crop_growth[x, y] = 0
+        self.crop_watered[x, y] = False
+        self.crop_ready[x, y] = False
+
+    def clear_crop(self, x, y):
+        self.dirty = True
+        self.crop[x, y] = NO_CROP
+        self.crop_growth[x, y] = 0
+        self.crop_watered[x, y] = False
+        self.crop_ready[x, y] = False
+
+    def nbytes(self):
+        """所有瓦片数组占用的字节数"""
+        return sum(array.nbytes for array in (
+            self.type, self.tilled, self.watered, self.forage,
+            self.crop, self.crop_growth, self.crop_watered, self.crop_ready, self.walkable
+        ))
+
+
+class TileView:
+    """单个瓦片的轻量视图，读写都直接落到 TileGrid 的数组上（i, j 为块内下标）"""
+    __slots__ = ("grid", "i", "j")
+
+    def __init__(self, grid, i, j):
+        self.grid = grid
+        self.i = i
+        self.j = j
+
+    @property
+    def x(self):
+        return self.grid.origin_x + self.i
+
+    @property
+    def y(self):
+        return self.grid.origin_y + self.j
+
+    @property
+    def type(self):
+        return self.grid.registry.names[self.grid.type[self.i, self.j]]
+
+    @type.setter
+    def type(self, value):
+        self.grid.set_type(self.i, self.j, self.grid.registry.codes[value])
+
+    @property
+    def tilled(self):
+        return bool(self.grid.tilled[self.i, self.j])
+
+    @tilled.setter
+    def tilled(self, value):
+        self.grid.dirty = True
+        self.grid.tilled[self.i, self.j] = value
+
+    @property
+    def watered(self):
+        return bool(self.grid.watered[self.i, self.j])
+
+    @watered.setter
+    def watered(self, value):
+        self.grid.dirty = True
+        self.grid.watered[self.i, self.j] = value
+
+    @property
+    def has_forage(self):
+        return self.grid.forage[self.i, self.j] != NO_FORAGE
+
+    @property
+    def forage_type(self):
+        return self.grid.registry.forage_names[self.grid.forage[self.i, self.j]]
+
+    @forage_type.setter
+    def forage_type(self, value):
+        self.grid.dirty = True
+        self.grid.forage[self.i, self.j] = self.grid.registry.forage_codes[value] if value else NO_FORAGE
+
+    @property
+    def crop(self):
+        if self.grid.crop[self.i, self.j] == NO_CROP:
+            return None
+        return CropView(self.grid, self.i, self.j)
+
+    @crop.setter
+    def crop(self, value):
+        # 只支持清除作物，种植请使用 TileGrid.plant_crop
+        if value is not None:
+            raise ValueError("use TileGrid.plant_crop to plant a crop")
+        self.grid.clear_crop(self.i, self.j)
+
+
+class CropView:
+    """瓦片上作物的轻量视图"""
+    __slots__ = ("grid", "i", "j")
+
+    def __init__(self, grid, i, j):
+        self.grid = grid
+        self.i = i
+        self.j = j
+
+    @property
+    def type(self):
+        return self.grid.registry.crop_names[self.grid.crop[self.i, self.j]]
+
+    @property
+    def growth_time(self):
+        return float(self.grid.registry.crop_growth_time[self.grid.crop[self.i, self.j]])
+
+    @property
+    def growth_days(self):
+        return float(self.grid.crop_growth[self.i, self.j])
+
+    @growth_days.setter
+    def growth_days(self, value):
+        self.grid.dirty = True
+        self.grid.crop_growth[self.i, self.j] = value
+
+    @property
+    def watered_today(self):
+        return bool(self.grid.crop_watered[self.i, self.j])
+
+    @watered_today.setter
+    def watered_today(self, value):
+        self.grid.dirty = True
+        self.grid.crop_watered[self.i, self.j] = value
+
+    @property
+    def is_ready(self):
+        return bool(self.grid.crop_ready[self.i, self.j])
+
+    @is_ready.setter
+    def is_ready(self, value):
+        self.grid.dirty = True
+        self.grid.crop_ready[self.i, self.j] = value
+
+    def grow(self):
+        if self.watered_today:
+            self.growth_days += 1
+            if self.growth_days >= self.growth_time:
+                self.is_ready = True
+        self.watered_today = False  # Reset for the new day
@@ -0,0 +1,124 @@
+import random
+import time
+from game.config import Config
+from game.world import World
+from game.player import Player
+from game.cat import Cat
+from game.population import CatPopulation
+from game.time_system import TimeSystem
+from game.clock import ManualClock
+from game.scheduler import Scheduler
+
+WAKE_UP_MINUTES = 6 * 60  # 睡醒是早上6点
+
+
+class HeadlessGame:
+    """无头模拟：不开窗口、不加载字体、不建 pygame_gui，用手动时钟尽快推进游戏
+
+    每一步与 Game.update 的规则相同（固定步长），玩家待在家里，
+    到了睡觉时间或者体力耗尽就睡觉进入下一天。
+    """
+
+    def __init__(self, config=None, seed=None):
+        self.config = config or Config()
+        if seed is not None:
+            random.seed(seed)
+            self.config.world_seed = seed
+
+        self.clock = ManualClock()
+        self.sim_step = 1.0 / self.config.sim_rate
+        self.scheduler = Scheduler(self.clock)
+        self.time_system = TimeSystem(self.clock)
+        self.world = World(self.config)
+        self.player = Player(self.config, self.world, self.clock, self.scheduler)
+        self.cat = Cat(self.config, self.player, self.clock, self.scheduler)
+        self.cafe_cats = None
+        if self.config.cafe_cats:
+            self.cafe_cats = CatPopulation(self.config, self.player, self.config.cafe_cats,
+                                           self.clock, self.scheduler, seed)
+        self.days = 0  # 已经过完的天数
+
+    def update(self):
+        """一个固定模拟步"""
+        self.clock.advance(self.sim_step * 1000)
+        self.time_system.update(self.sim_step)
+        self.scheduler.run_due()
+
+        self.world.set_focus(self.player.x, self.player.y)
+        self.world.update(self.time_system)
+
+        self.cat.update(self.world, self.player)
+        if self.cat.is_picked_up:
+            self.cat.x = self.player.x
+            self.cat.y = self.player.y
+        if self.cafe_cats:
+            self.cafe_cats.update(self.world, self.player)
+
+        if self.player.fishing_active or self.player.fishing_events:
+            self.player.update_fishing()
+
+        self.player.energy_tick()
+
+        if self.player.energy <= 0 or (self.time_system.is_sleep_time() and self.player.at_home()):
+            self.sleep()
+
+    def sleep(self):
+        """睡觉：不在家就是晕倒了，被送回家且只恢复一点体力"""
+        passed_out = not self.player.at_home()
+        self.time_system.advance_day()
+        self.time_system.minutes = WAKE_UP_MINUTES
+        self.player.sleep()
+        self.world.update_day()
+        if passed_out:
+            self.player.x, self.player.y = self.player.home_position
+            self.player.energy = 20
+        self.days += 1
+
+    def run_days(self, days):
+        target = self.days + days
+        while self.days < target:
+            self.update()
+
+    def simulate_days(self, days, water_crops=False):
+        """跳过逐帧循环，直接批量推进 days 天（经济/平衡性长跑用）"""
+        self.time_system.simulate_days(days)
+        self.time_system.minutes = WAKE_UP_MINUTES
+        self.world.simulate_days(days, water_crops)
+        self.player.sleep()
+        steps = days * self.steps_per_day()
+        self.cat.simulate_ticks(steps)
+        if self.cafe_cats:
+            self.cafe_cats.simulate_ticks(steps)
+        self.days += days
+
+    def steps_per_day(self):
+        """逐帧跑时一天（起床到睡觉）有多少个模拟步"""
+        real_seconds = (self.config.sleep_time_start - WAKE_UP_MINUTES) / self.time_system.time_scale
+        return round(real_seconds * self.config.sim_rate)
+
+    def summary(self):
+        return {
+            "date": self.time_system.get_date_string(),
+            "time": self.time_system.get_time_string(),
+            "money": self.player.money,
+            "energy": round(self.player.energy, 2),
+            "cat_hunger": round(self.cat.hunger, 2),
+            "cat_affection": round(self.cat.affection, 2),
+            "crops": len(self.world.planted_tiles),
+            "forage": len(self.world.foraging_areas),
+        }
+
+
+def run_headless(days, seed=None, batch=False):
+    """命令行入口：python main.py --headless --days N [--batch]"""
+    game = HeadlessGame(seed=seed)
+    start = time.perf_counter()
+    if batch:
+        game.simulate_days(days)
+    else:
+        game.run_days(days)
+    elapsed = time.perf_counter() - start
+
+    print(f"simulated {days} days in {elapsed:.3f}s ({days / max(elapsed, 1e-9) * 60:.0f} days/min)")
+    for key, value in game.summary().items():
+        print(f"  {key}: {value}")
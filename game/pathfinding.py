@@ -0,0 +1,522 @@
+import heapq
+from collections import OrderedDict
+import numpy as np
+
+UNREACHABLE = -1
+NEIGHBOUR_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
+SURROUNDING_OFFSETS = NEIGHBOUR_OFFSETS + ((-1, -1), (1, -1), (-1, 1), (1, 1))  # 周围一圈八格
+PRECOMPUTE_BATCH = 64  # 预计算时一批叠几个扇区做 BFS
+LOCAL_SECTORS = 2  # 起终点相距不到两个扇区时直接在附近窗口里做平面 A*，抽象图只管远路
+LAZY_BLOCK = 4  # 按需计算时把所在的 4x4 块里还没算的扇区一起算，省掉逐个扇区调 numpy 的开销
+
+
+class FlowField:
+    """以目标（玩家）为中心的距离场：窗口内每格到目标要走几步
+
+    目标换了格子、或窗口内有格子的通行性变了，才用 BFS 重算一次（按波前整层扩展）；
+    之后任意多个跟随者每步只需比较四个邻居的距离，往下坡走一格，O(1)。
+    窗口外或与目标不连通的格子没有距离，由调用方自己退回直线靠近。
+    """
+
+    def __init__(self, world, radius=32):
+        self.world = world
+        self.radius = radius
+        self.target = None
+        self.origin = (0, 0)
+        self.distance = np.full((0, 0), UNREACHABLE, dtype=np.int32)
+        self.stale = True
+        self.rebuilds = 0
+        world.add_walkability_listener(self.on_walkability_changed)
+
+    def on_walkability_changed(self, x, y):
+        ox, oy = self.origin
+        width, height = self.distance.shape
+        if 0 <= x - ox < width and 0 <= y - oy < height:
+            self.stale = True
+
+    def set_target(self, x, y):
+        """目标所在的格子，没有变化（且窗口内地形没变）时什么都不做"""
+        if self.stale or self.target != (x, y):
+            self.target = (x, y)
+            self.rebuild()
+
+    def rebuild(self):
+        tx, ty = self.target
+        size = 2 * self.radius + 1
+        ox, oy, walkable = self.world.walkable_window(tx - self.radius, ty - self.radius, size, size)
+        self.origin = (ox, oy)
+        self.stale = False
+        self.rebuilds += 1
+
+        distance = np.full(walkable.shape, UNREACHABLE, dtype=np.int32)
+        frontier = np.zeros(walkable.shape, dtype=bool)
+        frontier[tx - ox, ty - oy] = True  # 目标自己不要求可走（比如站在门口）
+        step = 0
+        while frontier.any():
+            distance[frontier] = step
+            step += 1
+            grown = np.zeros_like(frontier)
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            frontier = grown & walkable & (distance == UNREACHABLE)
+        self.distance = distance
+
+    def distance_at(self, xs, ys):
+        """各坐标到目标的步数，窗口外或不连通为 UNREACHABLE（支持数组）"""
+        ox, oy = self.origin
+        width, height = self.distance.shape
+        i = np.asarray(xs) - ox
+        j = np.asarray(ys) - oy
+        inside = (i >= 0) & (i < width) & (j >= 0) & (j < height)
+        return np.where(inside, self.distance[np.clip(i, 0, width - 1), np.clip(j, 0, height - 1)],
+                        UNREACHABLE)
+
+    def steps(self, xs, ys):
+        """每个跟随者的下一步：距离最小的邻居；没有更近的邻居时原地不动，返回 (new_x, new_y, 是否走了一步)
+
+        邻居按“先走主方向”的顺序比较，距离相同时与原来的直线跟随走法一致。
+        """
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        tx, ty = self.target
+        dx = np.sign(tx - xs)
+        dy = np.sign(ty - ys)
+        horizontal = np.abs(tx - xs) > np.abs(ty - ys)
+        zero = np.zeros_like(dx)
+        side_x = np.where(dx == 0, 1, dx)  # 正对着目标时，侧向两个方向都要试
+        side_y = np.where(dy == 0, 1, dy)
+        major = (np.where(horizontal, dx, zero), np.where(horizontal, zero, dy))
+        minor = (np.where(horizontal, zero, side_x), np.where(horizontal, side_y, zero))
+        candidates = [major, minor, (-minor[0], -minor[1]), (-major[0], -major[1])]
+
+        best = self.distance_at(xs, ys)
+        found = best != UNREACHABLE
+        best = np.where(found, best, np.iinfo(np.int32).max)
+        new_x, new_y = xs.copy(), ys.copy()
+        moved = np.zeros(xs.shape, dtype=bool)
+        for cx, cy in candidates:
+            nx, ny = xs + cx, ys + cy
+            d = self.distance_at(nx, ny)
+            better = (d != UNREACHABLE) & (d < best) & ((cx != 0) | (cy != 0))
+            best = np.where(better, d, best)
+            new_x = np.where(better, nx, new_x)
+            new_y = np.where(better, ny, new_y)
+            moved |= better
+        return new_x, new_y, moved
+
+    def step(self, x, y):
+        """单个跟随者的下一步 (x, y)，找不到路时返回 None（steps 的标量版本，省掉数组开销）"""
+        tx, ty = self.target
+        dx, dy = tx - x, ty - y
+        sx = (dx > 0) - (dx < 0)
+        sy = (dy > 0) - (dy < 0)
+        if abs(dx) > abs(dy):
+            side = sy or 1
+            candidates = ((sx, 0), (0, side), (0, -side), (-sx, 0))
+        else:
+            side = sx or 1
+            candidates = ((0, sy), (side, 0), (-side, 0), (0, -sy))
+
+        best = self.lookup(x, y)
+        if best == UNREACHABLE:
+            best = np.iinfo(np.int32).max
+        result = None
+        for cx, cy in candidates:
+            if cx == 0 and cy == 0:
+                continue
+            d = self.lookup(x + cx, y + cy)
+            if d != UNREACHABLE and d < best:
+                best = d
+                result = (x + cx, y + cy)
+        return result
+
+    def lookup(self, x, y):
+        ox, oy = self.origin
+        width, height = self.distance.shape
+        if 0 <= x - ox < width and 0 <= y - oy < height:
+            return int(self.distance[x - ox, y - oy])
+        return UNREACHABLE
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def passable(origin, walkable, x, y):
+    i, j = x - origin[0], y - origin[1]
+    return 0 <= i < len(walkable) and 0 <= j < len(walkable[i]) and walkable[i][j]
+
+
+def astar(origin, walkable, start, goal):
+    """网格 A*（四方向，曼哈顿距离启发）
+
+    origin 是通行位图左上角的世界坐标，walkable 是位图的嵌套列表（[x][y]），
+    只在这个范围内搜索。返回从 start 到 goal 的格子列表（含两端），走不到返回 None。
+    """
+    if not passable(origin, walkable, *goal):
+        return None
+    came_from = {start: None}
+    cost = {start: 0}
+    heap = [(manhattan(start, goal), 0, start)]  # f 相同时先展开走得远的（-g 小的）
+    while heap:
+        _, g, node = heapq.heappop(heap)
+        g = -g
+        if node == goal:
+            path = []
+            while node is not None:
+                path.append(node)
+                node = came_from[node]
+            path.reverse()
+            return path
+        if g > cost[node]:
+            continue
+        x, y = node
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            neighbour = (x + dx, y + dy)
+            if not passable(origin, walkable, *neighbour):
+                continue
+            if g + 1 < cost.get(neighbour, g + 2):
+                cost[neighbour] = g + 1
+                came_from[neighbour] = node
+                heapq.heappush(heap, (g + 1 + manhattan(neighbour, goal), -g - 1, neighbour))
+    return None
+
+
+def entrance_distances(cells, xs, ys):
+    """批量 BFS：每个扇区内每个入口到同扇区其他入口的步数
+
+    cells 是 (扇区数, 宽, 高) 的通行位图（四周补一圈不可走），xs/ys 是 (扇区数, 入口数) 的入口下标，
+    -1 表示空位。每一列压成一个 uint32（第 y 位表示第 y 格），所有扇区、所有入口的 BFS
+    叠成一个 (扇区数, 入口数, 宽) 的数组按波前整层推进：上下走是移位，左右走是错开一列。
+    返回 (扇区数, 入口数, 入口数) 的步数表，走不到为 UNREACHABLE。
+    """
+    sectors, count = xs.shape
+    columns = (cells.astype(np.uint32) << np.arange(cells.shape[2], dtype=np.uint32)).sum(axis=2, dtype=np.uint32)
+    used = xs >= 0
+    # 空位的 x 下标是 -1，落在补边那一列上，那一列永远走不到
+    bits = np.where(used, np.uint32(1) << np.maximum(ys, 0).astype(np.uint32), 0).astype(np.uint32)
+    frontier = np.zeros((sectors, count, cells.shape[1]), dtype=np.uint32)
+    sector_index, entrance_index = np.nonzero(used)
+    frontier[sector_index, entrance_index, xs[sector_index, entrance_index]] = bits[sector_index, entrance_index]
+    reached = frontier.copy()
+    walls = ~columns[:, None]
+    # 只在入口格子上读结果：(扇区, 起点入口, 终点入口)
+    targets = (np.arange(sectors)[:, None, None], np.arange(count)[None, :, None], xs[:, None, :])
+    target_bits = bits[:, None, :]
+    table = np.where(frontier[targets] & target_bits, 0, UNREACHABLE)
+    pending = (table == UNREACHABLE) & used[:, None, :] & used[:, :, None]
+    step = 0
+    while pending.any():
+        grown = (frontier << 1) | (frontier >> 1)
+        grown[:, :, 1:] |= frontier[:, :, :-1]
+        grown[:, :, :-1] |= frontier[:, :, 1:]
+        grown &= ~(reached | walls)
+        if not grown.any():
+            break
+        step += 1
+        hit = (grown[targets] & target_bits) != 0
+        table[hit] = step
+        pending &= ~hit
+        reached |= grown
+        frontier = grown
+    return table
+
+
+class SectorGraph:
+    """分层寻路（HPA*）：把地图切成 sector_size 见方的扇区，只在扇区边界的入口之间建抽象图
+
+    长距离路线先在抽象图上做 A*（节点只有入口），再把相邻两个入口之间的一小段在扇区内细化；
+    相距不到 LOCAL_SECTORS 个扇区的近路直接在附近的窗口里做平面 A*，不绕入口。
+    扇区的入口和扇区内入口之间的距离由 precompute 一次算好（整张地图在内存里时 World 建好就调用），
+    区块地图则在第一次用到时按 4x4 块成批算好并缓存；抽象图上的 A* 不放大启发，路线接近最短。
+    某格通行性变化时只丢掉它所在扇区和相邻扇区的缓存，下次用到再重算。
+    """
+
+    def __init__(self, world, sector_size=16):
+        self.world = world
+        self.size = sector_size
+        self.windows = {}  # 扇区 -> (左上角, 通行位图嵌套列表)
+        self.padding = {}  # 扇区 -> 补边压平后的通行位图
+        self.segments = {}  # 扇区 -> {(入口, 入口): 逐格路线}
+        self.borders = {}  # (扇区, 相邻扇区) -> [(这边的入口, 那边的入口)]
+        self.edges = {}  # 扇区 -> {入口: [(相连的入口, 步数)]}
+        self.repairs = 0
+        world.add_walkability_listener(self.on_walkability_changed)
+
+    def sector_of(self, x, y):
+        return x // self.size, y // self.size
+
+    def neighbour_sectors(self, sector):
+        sx, sy = sector
+        for dx, dy in NEIGHBOUR_OFFSETS:
+            nx, ny = sx + dx, sy + dy
+            if 0 <= nx * self.size < self.world.width and 0 <= ny * self.size < self.world.height:
+                yield nx, ny
+
+    def window(self, sector):
+        """扇区的通行位图（缓存）"""
+        cached = self.windows.get(sector)
+        if cached is None:
+            x0, y0, walkable = self.world.walkable_window(sector[0] * self.size, sector[1] * self.size,
+                                                          self.size, self.size)
+            cached = self.windows[sector] = ((x0, y0), walkable.tolist())
+        return cached
+
+    def padded(self, sector):
+        """扇区通行位图四周补一圈不可走的格子再压平（缓存），BFS 只做整数下标运算"""
+        cached = self.padding.get(sector)
+        if cached is None:
+            _, walkable = self.window(sector)
+            padded = np.zeros((len(walkable) + 2, len(walkable[0]) + 2), dtype=bool)
+            padded[1:-1, 1:-1] = walkable
+            cached = self.padding[sector] = padded.ravel().tolist()
+        return cached
+
+    def distances(self, sector, source, targets):
+        """从 source 出发在扇区内 BFS，返回能走到的 targets 的步数：{格子: 步数}"""
+        (ox, oy), walkable = self.window(sector)
+        stride = len(walkable[0]) + 2
+        passable_cells = self.padded(sector)
+        offsets = (-stride, stride, -1, 1)
+        wanted = {(x - ox + 1) * stride + y - oy + 1: (x, y) for x, y in targets}
+        found = {}
+        first = (source[0] - ox + 1) * stride + source[1] - oy + 1
+        distance = [-1] * len(passable_cells)
+        distance[first] = 0
+        queue = [first]
+        for cell in queue:  # 边遍历边追加，相当于先进先出队列
+            if cell in wanted:
+                found[wanted[cell]] = distance[cell]
+                if len(found) == len(wanted):
+                    break
+            step = distance[cell] + 1
+            for offset in offsets:
+                neighbour = cell + offset
+                if passable_cells[neighbour] and distance[neighbour] < 0:
+                    distance[neighbour] = step
+                    queue.append(neighbour)
+        return found
+
+    def border(self, sector, other):
+        """两个相邻扇区之间的入口：边界上两侧都能走的连续一段取一个（长的一段取两端两个）"""
+        key = (sector, other)
+        if key in self.borders:
+            return self.borders[key]
+        origin, walkable = self.window(sector)
+        other_origin, other_walkable = self.window(other)
+        dx, dy = other[0] - sector[0], other[1] - sector[1]
+        if dx:
+            x = origin[0] + (len(walkable) - 1 if dx > 0 else 0)
+            here = walkable[-1 if dx > 0 else 0]
+            there = other_walkable[0 if dx > 0 else -1]
+            line = [((x, y), (x + dx, y)) for y in range(origin[1], origin[1] + len(walkable[0]))]
+        else:
+            y = origin[1] + (len(walkable[0]) - 1 if dy > 0 else 0)
+            here = [column[-1 if dy > 0 else 0] for column in walkable]
+            there = [column[0 if dy > 0 else -1] for column in other_walkable]
+            line = [((x, y), (x, y + dy)) for x in range(origin[0], origin[0] + len(walkable))]
+
+        entrances = []
+        run = []
+        for pair, open_here, open_there in zip(line + [None], here + [False], there + [False]):
+            if open_here and open_there:  # 末尾补的 False 用来收尾最后一段
+                run.append(pair)
+                continue
+            if len(run) > 5:
+                entrances += [run[0], run[-1]]
+            elif run:
+                entrances.append(run[len(run) // 2])
+            run = []
+        self.borders[key] = entrances
+        self.borders[(other, sector)] = [(there, here) for here, there in entrances]
+        return entrances
+
+    def crossings(self, sector):
+        """扇区边界上的入口，以及每个入口穿过边界到相邻扇区入口的一步：{入口: [(那边的入口, 1)]}"""
+        crossings = {}
+        for other in self.neighbour_sectors(sector):
+            for here, there in self.border(sector, other):
+                crossings.setdefault(here, []).append((there, 1))
+        return crossings
+
+    def sector_edges(self, sector):
+        """扇区内各入口之间的步数，以及穿过边界到相邻扇区入口的一步"""
+        edges = self.edges.get(sector)
+        if edges is None:
+            bx, by = sector[0] // LAZY_BLOCK * LAZY_BLOCK, sector[1] // LAZY_BLOCK * LAZY_BLOCK
+            self.build_edges([(sx, sy) for sx in range(bx, bx + LAZY_BLOCK) for sy in range(by, by + LAZY_BLOCK)
+                              if sx * self.size < self.world.width and sy * self.size < self.world.height
+                              and (sx, sy) not in self.edges])
+            edges = self.edges[sector]
+        return edges
+
+    def build_edges(self, sectors):
+        """一批扇区的边一起算：所有扇区、所有入口的 BFS 叠在一个数组里推进（见 entrance_distances）"""
+        crossings = [self.crossings(sector) for sector in sectors]
+        count = max([len(nodes) for nodes in crossings] + [1])
+        cells = np.zeros((len(sectors), self.size + 2, self.size + 2), dtype=bool)
+        xs = np.full((len(sectors), count), -1, dtype=np.intp)
+        ys = np.full((len(sectors), count), -1, dtype=np.intp)
+        for index, (sector, nodes) in enumerate(zip(sectors, crossings)):
+            (ox, oy), walkable = self.window(sector)
+            cells[index, 1:len(walkable) + 1, 1:len(walkable[0]) + 1] = walkable
+            for k, (x, y) in enumerate(nodes):
+                xs[index, k] = x - ox + 1
+                ys[index, k] = y - oy + 1
+        tables = entrance_distances(cells, xs, ys).tolist()
+        for sector, nodes, table in zip(sectors, crossings, tables):
+            edges = {}
+            for node, row in zip(nodes, table):
+                edges[node] = nodes[node] + [(other, step) for other, step in zip(nodes, row)
+                                             if other != node and step != UNREACHABLE]
+            self.edges[sector] = edges
+
+    def precompute(self, batch=PRECOMPUTE_BATCH):
+        """一次算好所有还没算的扇区（否则按需计算）"""
+        pending = [(sx, sy) for sx in range((self.world.width + self.size - 1) // self.size)
+                   for sy in range((self.world.height + self.size - 1) // self.size)
+                   if (sx, sy) not in self.edges]
+        for start in range(0, len(pending), batch):
+            self.build_edges(pending[start:start + batch])
+
+    def on_walkability_changed(self, x, y):
+        """增量修补：只作废这个扇区和相邻扇区（入口可能变了）的缓存"""
+        sector = self.sector_of(x, y)
+        self.windows.pop(sector, None)
+        self.padding.pop(sector, None)
+        self.segments.pop(sector, None)
+        self.edges.pop(sector, None)
+        for other in self.neighbour_sectors(sector):
+            self.borders.pop((sector, other), None)
+            self.borders.pop((other, sector), None)
+            self.edges.pop(other, None)
+        self.repairs += 1
+
+    def find_path(self, start, goal):
+        """从 start 到 goal 的格子列表（含两端），走不到返回 None"""
+        if start == goal:
+            return [start]
+        start_sector, goal_sector = self.sector_of(*start), self.sector_of(*goal)
+        if max(abs(start[0] - goal[0]), abs(start[1] - goal[1])) < LOCAL_SECTORS * self.size:
+            # 近路：两点的包围盒外扩一个扇区，在里面做平面 A* 得到最短路；窗口里走不通再走抽象图
+            x0, y0 = min(start[0], goal[0]) - self.size, min(start[1], goal[1]) - self.size
+            x1, y1 = max(start[0], goal[0]) + self.size, max(start[1], goal[1]) + self.size
+            x0, y0, walkable = self.world.walkable_window(x0, y0, x1 - x0 + 1, y1 - y0 + 1)
+            path = astar((x0, y0), walkable.tolist(), start, goal)
+            if path:
+                return path
+
+        if not passable(*self.window(goal_sector), *goal):
+            return None
+
+        # 起点和终点临时接入抽象图
+        start_links = [(node, step) for node, step in
+                       self.distances(start_sector, start, self.sector_edges(start_sector)).items() if node != start]
+        goal_distances = self.distances(goal_sector, goal, self.sector_edges(goal_sector))
+
+        def neighbours(node):
+            links = self.sector_edges(self.sector_of(*node)).get(node, [])
+            if node == start:
+                links = links + start_links
+            if node in goal_distances:
+                links = links + [(goal, goal_distances[node])]
+            return links
+
+        came_from = {start: None}
+        cost = {start: 0}
+        goal_x, goal_y = goal
+        heap = [(manhattan(start, goal), 0, start)]
+        while heap:
+            _, g, node = heapq.heappop(heap)
+            g = -g
+            if node == goal:
+                break
+            if g > cost[node]:
+                continue
+            for neighbour, step in neighbours(node):
+                if g + step < cost.get(neighbour, float("inf")):
+                    cost[neighbour] = g + step
+                    came_from[neighbour] = node
+                    estimate = abs(neighbour[0] - goal_x) + abs(neighbour[1] - goal_y)
+                    heapq.heappush(heap, (g + step + estimate, -g - step, neighbour))
+        else:
+            return None
+
+        waypoints = []
+        node = goal
+        while node is not None:
+            waypoints.append(node)
+            node = came_from[node]
+        waypoints.reverse()
+        return self.refine(waypoints)
+
+    def segment(self, sector, a, b):
+        """扇区内 a 到 b 的逐格路线；两端都是入口时缓存起来"""
+        segments = self.segments.setdefault(sector, {})
+        path = segments.get((a, b))
+        if path is None:
+            path = astar(*self.window(sector), a, b)
+            edges = self.sector_edges(sector)
+            if a in edges and b in edges:
+                segments[(a, b)] = path
+        return path
+
+    def refine(self, waypoints):
+        """把抽象路径的每一段在扇区内展开成逐格的路线"""
+        path = [waypoints[0]]
+        for a, b in zip(waypoints, waypoints[1:]):
+            sector = self.sector_of(*a)
+            if sector == self.sector_of(*b):
+                path += self.segment(sector, a, b)[1:]
+            else:
+                path.append(b)  # 穿过边界的一步
+        return path
+
+
+class RouteCache:
+    """常去目的地（家、河边、农田）的路线缓存
+
+    路线按 (起点, 终点) 记下，最近用过的留着，最多 max_routes 条。
+    起点落在某条去同一终点的已缓存路线上时，直接取那条路线的后半段。
+    只有路线上或紧挨着路线（周围一圈）的格子通行性变了，这条路线才作废；
+    外扩一格的包围盒只用来先快速排除离得远的修改。
+    """
+
+    def __init__(self, world, max_routes=32):
+        self.world = world
+        self.max_routes = max_routes
+        self.routes = OrderedDict()  # (起点, 终点) -> (路线, 包围盒, {格子: 路线上的下标})
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        world.add_walkability_listener(self.on_walkability_changed)
+
+    def route(self, start, goal):
+        """从 start 到 goal 的逐格路线（含两端），走不到返回 None"""
+        for key, (route, _, index) in self.routes.items():
+            if key[1] == goal and start in index:
+                self.routes.move_to_end(key)
+                self.hits += 1
+                return route[index[start]:]
+
+        self.misses += 1
+        route = self.world.find_path(start, goal)
+        if route is None:
+            return None
+        xs = [x for x, _ in route]
+        ys = [y for _, y in route]
+        bounds = (min(xs) - 1, min(ys) - 1, max(xs) + 1, max(ys) + 1)
+        self.routes[(start, goal)] = (route, bounds, {tile: i for i, tile in enumerate(route)})
+        if len(self.routes) > self.max_routes:
+            self.routes.popitem(last=False)
+        return route
+
+    def on_walkability_changed(self, x, y):
+        for key, (_, (x0, y0, x1, y1), index) in list(self.routes.items()):
+            if not (x0 <= x <= x1 and y0 <= y <= y1):
+                continue
+            if (x, y) in index or any((x + dx, y + dy) in index for dx, dy in SURROUNDING_OFFSETS):
+                del self.routes[key]
+                self.invalidated += 1
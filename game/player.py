@@ -1,12 +1,19 @@
 import pygame
 import random
+from game.glyph_atlas import get_glyph_atlas
+from game.render import interpolate
+from game.clock import RealClock
+from game.scheduler import Scheduler
 
 class Player:
-    def __init__(self, config, world):
+    def __init__(self, config, world, clock=None, scheduler=None):
         self.config = config
+        self.clock = clock or RealClock()
+        self.scheduler = scheduler or Scheduler(self.clock)  # 由游戏主循环每步 run_due
         self.world = world  # Store reference to world
         self.x = world.home_position[0]
         self.y = world.home_position[1]
+        self.prev_x, self.prev_y = self.x, self.y  # 上一个模拟步的位置，绘制时插值用
         self.home_position = world.home_position
         self.energy = config.max_energy
         self.money = 500  # Starting money
@@ -20,6 +27,8 @@ class Player:
         
         # 钓鱼状态
         self.fishing_active = False
+        self.fishing_spot = None  # 下竿的位置，决定钓的是哪个水体
+        self.hooked_fish = None  # 下竿时就决定哪种鱼会上钩，钓光了的水体不会有鱼咬钩
         self.fishing_start_time = 0
         self.fish_bite_time = 0  # 鱼上钩的时间
         self.waiting_for_fish = False  # 是否在等待鱼上钩
@@ -42,6 +51,15 @@ class Player:
         self.max_minigame_time = 10000  # 小游戏最大时间10秒
         self.fish_struggle_timer = 0
         
+        # 钓鱼的定时器（上钩、逃走、换方向、挣扎、超时）和它们产生的事件
+        self.fishing_timers = []
+        self.fishing_events = []
+        
+        # 点击移动：剩下要走的格子
+        self.route = []
+        self.route_cooldown = 0
+        self.screen_position = (0, 0)  # 上一帧画在屏幕上的位置（像素）
+        
         self.selected_seed = "turnip_seeds"
         
         # Visual representation
@@ -52,14 +70,8 @@ class Player:
         new_x = self.x + dx
         new_y = self.y + dy
         
-        # Debug output
-        print(f"Trying to move from ({self.x}, {self.y}) to ({new_x}, {new_y})")
-        
         # Check if the destination is walkable
-        walkable = world.is_walkable(new_x, new_y)
-        print(f"Destination walkable: {walkable}")
-        
-        if walkable:
+        if world.is_walkable(new_x, new_y):
             self.x = new_x
             self.y = new_y
             
@@ -73,6 +85,38 @@ class Player:
             return True
         return False
     
+    def walk_to(self, x, y):
+        """点击移动：沿缓存的路线走向 (x, y)，目标走不上去（比如水面）就走到它旁边"""
+        goal = (x, y)
+        if not self.world.is_walkable(x, y):
+            neighbours = self.world.walkable_neighbours(x, y)
+            if not neighbours:
+                return False
+            goal = min(neighbours, key=lambda tile: abs(tile[0] - self.x) + abs(tile[1] - self.y))
+        route = self.world.route_to((self.x, self.y), goal)
+        self.route = route[1:] if route else []
+        self.route_cooldown = 0
+        return route is not None
+    
+    def stop_route(self):
+        """键盘移动等手动操作会打断点击移动"""
+        self.route = []
+    
+    def follow_route(self):
+        """每个模拟步调用一次，每 auto_walk_interval 步沿路线走一格（和按键移动一样消耗体力）"""
+        if not self.route:
+            return
+        if self.route_cooldown > 0:
+            self.route_cooldown -= 1
+            return
+        self.route_cooldown = self.config.auto_walk_interval
+        x, y = self.route[0]
+        if abs(x - self.x) + abs(y - self.y) == 1 and self.move(x - self.x, y - self.y, self.world):
+            self.route.pop(0)
+        elif not self.walk_to(*self.route[-1]):
+            # 路被挡住或者玩家被挪了位置，重新找路也走不到就停下
+            self.route = []
+    
     def consume_energy(self, action):
         energy_cost = self.config.energy_consumption.get(action, 0)
         self.energy = max(0, self.energy - energy_cost)
@@ -177,12 +221,18 @@ class Player:
             if world.start_fishing(self.x, self.y):
                 if self.energy >= self.config.energy_consumption["fishing"]:
                     self.fishing_active = True
+                    self.fishing_spot = (self.x, self.y)
+                    self.hooked_fish = world.hook_fish(self.x, self.y)
                     self.waiting_for_fish = True
                     self.fish_on_hook = False
-                    current_time = pygame.time.get_ticks()
+                    current_time = self.clock.get_ticks()
                     self.fishing_start_time = current_time
-                    # 随机2-6秒后鱼上钩
+                    # 随机2-6秒后鱼上钩；没有鱼的话等到同样的时间就收竿
                     self.fish_bite_time = current_time + random.randint(2000, 6000)
+                    if self.hooked_fish:
+                        self.add_fishing_timer(self.fish_bite_time, self.on_fish_bite)
+                    else:
+                        self.add_fishing_timer(self.fish_bite_time, self.end_fishing, "no_bite")
                     # 消耗能量
                     self.consume_energy("fishing")
                     return True
@@ -277,13 +327,7 @@ class Player:
             # 7. 其他障碍物
             elif not world.is_walkable(front_x, front_y):
                 # 确定障碍物类型
-                obstacle_type = "未知"
-                if front_tile.type == "water":
-                    obstacle_type = "water"
-                elif front_tile.type == "tree":
-                    obstacle_type = "tree"
-                elif front_tile.type == "rock":
-                    obstacle_type = "rock"
+                obstacle_type = world.blocking_reason(front_x, front_y) or "未知"
                 
                 return True, obstacle_type
         
@@ -305,65 +349,93 @@ class Player:
             return self.x, self.y
         
         # 尝试移动到最近的相邻位置
-        directions = [
-            (target_x-1, target_y), (target_x+1, target_y),
-            (target_x, target_y-1), (target_x, target_y+1)
-        ]
-        
-        for nx, ny in directions:
-            if self.world.is_walkable(nx, ny):
-                return nx, ny
+        neighbours = self.world.walkable_neighbours(target_x, target_y)
+        if neighbours:
+            return neighbours[0]
         
         # 如果没有找到可行走位置，则返回当前位置
         return self.x, self.y
     
-    def draw(self, screen):
+    def draw(self, screen, alpha=1.0):
         # Get the view boundaries from world
-        view_x_start = self.world.view_x_start
-        view_y_start = self.world.view_y_start
+        view_x_start = self.world.view_x
+        view_y_start = self.world.view_y
         
-        # Calculate screen position
-        screen_x = (self.x - view_x_start) * self.config.tile_size
-        screen_y = (self.y - view_y_start) * self.config.tile_size
+        # Calculate screen position (interpolated between simulation steps)
+        screen_x = round((interpolate(self.prev_x, self.x, alpha) - view_x_start) * self.config.tile_size)
+        screen_y = round((interpolate(self.prev_y, self.y, alpha) - view_y_start) * self.config.tile_size)
         
-        # Create and render the player character
-        from game.util import get_font
-        font = get_font(is_ascii=True, size=self.config.tile_size)
-        text_surface = font.render(self.symbol, True, self.color)
-        screen.blit(text_surface, (screen_x, screen_y))
+        self.screen_position = (screen_x, screen_y)
+        
+        # Draw the player character from the glyph atlas
+        atlas = get_glyph_atlas(self.config)
+        drawn = atlas.blit(screen, self.symbol, self.color, (screen_x, screen_y))
         
         # Also draw a little indicator for which way the player is facing
         # This is useful for determining which tile the player will interact with
         if self.fishing_active:
             # Draw fishing animation - use simple ASCII instead of emoji
             fishing_text = ">"
-            fishing_surface = font.render(fishing_text, True, (255, 255, 255))
-            screen.blit(fishing_surface, (screen_x + self.config.tile_size, screen_y))
+            drawn.union_ip(atlas.blit(screen, fishing_text, (255, 255, 255),
+                                      (screen_x + self.config.tile_size, screen_y)))
+        
+        return drawn
     
     def update_fishing(self):
-        """更新钓鱼状态"""
-        if not self.fishing_active:
-            return
-        
-        current_time = pygame.time.get_ticks()
+        """更新钓鱼状态，返回定时器产生的事件（"fish_bite"、"fish_escape"、"line_break"、"no_bite"）"""
+        # 定时器触发的事件优先返回
+        if self.fishing_events:
+            return self.fishing_events.pop(0)
         
-        # 检查是否到了鱼上钩的时间
-        if self.waiting_for_fish and current_time >= self.fish_bite_time:
-            self.fish_on_hook = True
-            self.waiting_for_fish = False
-            self.fish_escape_time = current_time + self.hook_response_time
-            return "fish_bite"  # 返回鱼上钩的信息
+        if not self.fishing_active:
+            return None
         
         # 如果钓鱼小游戏激活，更新小游戏状态
         if self.fishing_minigame_active:
             return self.update_fishing_minigame()
         
-        # 检查鱼是否逃走
-        if self.fish_on_hook and current_time >= self.fish_escape_time:
-            self.reset_fishing()
-            return "fish_escape"  # 返回鱼逃走的信息
-        
-        return None 
+        return None
+    
+    def add_fishing_timer(self, when, callback, *args):
+        """登记一个钓鱼定时器，reset_fishing 时统一取消"""
+        self.fishing_timers = [timer for timer in self.fishing_timers if not timer.cancelled]
+        self.fishing_timers.append(self.scheduler.call_at(when, callback, *args))
+    
+    def end_fishing(self, event):
+        """钓鱼因定时器结束（鱼跑了/线断了/没有鱼咬钩）"""
+        self.reset_fishing()
+        self.fishing_events.append(event)
+    
+    def on_fish_bite(self):
+        self.fish_on_hook = True
+        self.waiting_for_fish = False
+        self.fish_escape_time = self.fish_bite_time + self.hook_response_time
+        self.fishing_events.append("fish_bite")  # 返回鱼上钩的信息
+        self.add_fishing_timer(self.fish_escape_time, self.on_fish_escape)
+    
+    def on_fish_escape(self):
+        # 已经开始小游戏的话，鱼就不会因为没响应而逃走
+        if self.fish_on_hook and not self.fishing_minigame_active:
+            self.end_fishing("fish_escape")  # 返回鱼逃走的信息
+    
+    def on_fish_direction_change(self):
+        self.fish_direction = random.randint(0, 3)
+        self.fish_direction_change_time += random.randint(800, 2500)
+        self.add_fishing_timer(self.fish_direction_change_time, self.on_fish_direction_change)
+    
+    def on_fish_struggle(self):
+        # 鱼的挣扎会减少张力（每100ms一次）
+        self.tension -= random.randint(2, 5)
+        self.fish_struggle_timer += 100
+        
+        # 张力过低会让鱼逃走
+        if self.tension <= 0:
+            self.end_fishing("fish_escape")
+        # 张力过高会断线
+        elif self.tension >= 100:
+            self.end_fishing("line_break")
+        else:
+            self.add_fishing_timer(self.fish_struggle_timer + 100, self.on_fish_struggle)
     
     def try_catch_fish(self):
         """尝试钓鱼"""
@@ -379,18 +451,19 @@ class Player:
         self.fish_stamina = 100
         self.fish_max_stamina = 100
         self.fish_direction = random.randint(0, 3)
-        self.fish_direction_change_time = pygame.time.get_ticks() + random.randint(1000, 3000)
+        self.fish_direction_change_time = self.clock.get_ticks() + random.randint(1000, 3000)
         self.tension = 50
         self.reel_power = 0
         self.reel_power_direction = 1
-        self.minigame_timer = pygame.time.get_ticks()
-        self.fish_struggle_timer = pygame.time.get_ticks()
+        self.minigame_timer = self.clock.get_ticks()
+        self.fish_struggle_timer = self.clock.get_ticks()
+        self.add_fishing_timer(self.fish_direction_change_time, self.on_fish_direction_change)
+        self.add_fishing_timer(self.fish_struggle_timer + 100, self.on_fish_struggle)
+        # 小游戏超时鱼就跑了
+        self.add_fishing_timer(self.minigame_timer + self.max_minigame_time, self.end_fishing, "fish_escape")
         
-        # 根据鱼的类型调整难度
-        fish_types = list(self.config.fish_types.keys())
-        # 简单随机选择一种鱼类型来确定难度
-        selected_fish = random.choice(fish_types)
-        difficulty = self.config.fish_types[selected_fish]["difficulty"]
+        # 根据上钩的鱼调整难度
+        difficulty = self.config.fish_types[self.hooked_fish]["difficulty"]
         
         # 调整完美区域大小和鱼的耐力
         zone_size = max(10, 30 - difficulty * 4)  # 难度越高，完美区域越小
@@ -400,14 +473,7 @@ class Player:
         self.fish_stamina = self.fish_max_stamina
     
     def update_fishing_minigame(self):
-        """更新钓鱼小游戏状态"""
-        current_time = pygame.time.get_ticks()
-        
-        # 检查小游戏是否超时
-        if current_time - self.minigame_timer > self.max_minigame_time:
-            self.reset_fishing()
-            return "fish_escape"
-        
+        """更新钓鱼小游戏状态（超时、鱼换方向和挣扎由定时器处理）"""
         # 更新力度条
         self.reel_power += self.reel_power_direction * 2
         if self.reel_power >= 100:
@@ -417,26 +483,6 @@ class Player:
             self.reel_power = 0
             self.reel_power_direction = 1
         
-        # 更新鱼的方向
-        if current_time >= self.fish_direction_change_time:
-            self.fish_direction = random.randint(0, 3)
-            self.fish_direction_change_time = current_time + random.randint(800, 2500)
-        
-        # 鱼的挣扎会减少张力
-        if current_time - self.fish_struggle_timer > 100:  # 每100ms更新一次
-            self.tension -= random.randint(2, 5)
-            self.fish_struggle_timer = current_time
-            
-            # 张力过低会让鱼逃走
-            if self.tension <= 0:
-                self.reset_fishing()
-                return "fish_escape"
-            
-            # 张力过高会断线
-            if self.tension >= 100:
-                self.reset_fishing()
-                return "line_break"
-        
         return "minigame_active"
     
     def handle_fishing_input(self, key):
@@ -475,7 +521,7 @@ class Player:
             self.fish_stamina -= random.randint(15, 25)
             if self.fish_stamina <= 0:
                 # 成功钓到鱼
-                fish_type, value = self.world.catch_fish(difficulty=0.2)  # 降低失败率
+                fish_type, value = self.world.catch_fish(0.2, *self.fishing_spot, self.hooked_fish)  # 降低失败率
                 self.reset_fishing()
                 if fish_type:
                     # 添加到背包
@@ -497,7 +543,7 @@ class Player:
                 
             if self.fish_stamina <= 0:
                 # 成功钓到鱼，但质量较低
-                fish_type, value = self.world.catch_fish(difficulty=0.5)
+                fish_type, value = self.world.catch_fish(0.5, *self.fishing_spot, self.hooked_fish)
                 self.reset_fishing()
                 if fish_type:
                     # 添加到背包
@@ -511,9 +557,13 @@ class Player:
     
     def reset_fishing(self):
         """重置钓鱼状态"""
+        for timer in self.fishing_timers:
+            timer.cancel()
+        self.fishing_timers = []
         self.fishing_active = False
         self.waiting_for_fish = False
         self.fish_on_hook = False
+        self.hooked_fish = None
         self.fishing_start_time = 0
         self.fish_bite_time = 0
         self.fish_escape_time = 0
@@ -0,0 +1,368 @@
+import numpy as np
+from game.cat import Cat
+from game.glyph_atlas import get_glyph_atlas
+from game.clock import RealClock
+from game.scheduler import Scheduler
+from game.spatial import SpatialHash
+
+# 行为枚举（与 Cat.current_behavior 的字符串一一对应）
+BEHAVIORS = ("follow", "wander", "sit")
+FOLLOW, WANDER, SIT = range(len(BEHAVIORS))
+
+# 技能位掩码（顺序与 Cat.skills 相同）；解锁仍由 Cat.check_skill_unlocks 在喂食/抚摸时经 CatView 完成
+SKILLS = ("auto_track", "charm", "pest_control", "watering", "growth_boost",
+          "treasure_finder", "fish_helper", "intimidate")
+SKILL_BITS = {name: 1 << bit for bit, name in enumerate(SKILLS)}
+
+# 与 Cat 相同的节奏（单位：模拟步）和概率
+MOVE_COOLDOWN = 5
+WANDER_EVERY = 10
+FISHING_STEPS = 60
+FISHING_COOLDOWN = 180
+FISHING_START_CHANCE = 0.1
+BEHAVIOR_CHANGE_CHANCE = 0.01
+SKILL_CHANCE = 0.01
+SPAWN_ROUNDS = 100  # 放猫时最多随机取几轮位置
+DIRECTIONS = np.array([(0, 1), (1, 0), (0, -1), (-1, 0)])
+
+# 存在种群数组里的 Cat 属性
+ARRAY_FIELDS = ("x", "y", "prev_x", "prev_y", "hunger", "affection", "move_cooldown", "random_movement_counter",
+                "is_fishing", "fishing_progress", "fishing_cooldown", "fish_caught")
+
+
+class CatPopulation:
+    """猫咖模式：成百上千只猫的状态按列存成数组，每个模拟步对所有猫做一次向量化更新
+
+    位置、饥饿、好感、冷却、行为枚举和技能位掩码都是数组；规则与单只 Cat.update 相同，
+    只有一点不同：Cat.update 从不调用 choose_behavior（单只猫一直跟着玩家），
+    猫咖的猫每步按 Cat.choose_behavior 的 1% 概率换一种行为，否则满屏的猫都挤在玩家身后。
+    捕鱼、浇水这类低概率事件用几何分布预先抽好倒数，只有到点的那几只猫才逐只处理。
+    view(i) 返回与 Cat 兼容的视图，对话、喂食、抚摸等交互直接复用 Cat 的方法。
+    """
+
+    def __init__(self, config, player, count, clock=None, scheduler=None, seed=None, entities=None):
+        self.config = config
+        self.player = player
+        self.world = player.world
+        self.clock = clock or RealClock()
+        self.scheduler = scheduler or Scheduler(self.clock)
+        self.rng = np.random.default_rng(seed)
+
+        self.x, self.y = self.spawn_positions(count)
+        self.count = count = len(self.x)  # 周围可走的格子太少时会少放几只
+        self.prev_x, self.prev_y = self.x.copy(), self.y.copy()
+        self.hunger = np.zeros(count)
+        self.affection = np.full(count, 50.0)
+        self.move_cooldown = np.zeros(count, dtype=np.int16)
+        self.random_movement_counter = np.zeros(count, dtype=np.int16)
+        self.is_fishing = np.zeros(count, dtype=bool)
+        self.fishing_progress = np.zeros(count, dtype=np.int16)
+        self.fishing_cooldown = np.zeros(count, dtype=np.int16)
+        self.fish_caught = np.zeros(count, dtype=np.int32)
+        self.behavior = np.full(count, FOLLOW, dtype=np.uint8)
+        self.skills = np.full(count, SKILL_BITS["auto_track"], dtype=np.uint8)
+
+        # 低概率事件的倒数（几何分布，见 EventSampler）
+        self.fishing_countdown = self.rng.geometric(FISHING_START_CHANCE, count)
+        self.behavior_countdown = self.rng.geometric(BEHAVIOR_CHANGE_CHANCE, count)
+        self.watering_countdown = self.rng.geometric(SKILL_CHANCE, count)
+        self.growth_boost_countdown = self.rng.geometric(SKILL_CHANCE, count)
+
+        self.views = {}  # 编号 -> CatView，按需创建
+
+        # 空间哈希里的键是 ("cafe_cat", 编号)，可以与其他实体共用一张表
+        self.entities = entities or SpatialHash(config.spatial_cell_size)
+        for index, (x, y) in enumerate(zip(self.x.tolist(), self.y.tolist())):
+            self.entities.insert(("cafe_cat", index), x, y)
+        self.synced_x, self.synced_y = self.x.copy(), self.y.copy()
+
+    def spawn_positions(self, count, radius=10):
+        """在玩家附近的可走格子上随机放猫；试了 SPAWN_ROUNDS 轮还放不满就只返回放下的那些"""
+        x = np.empty(count, dtype=np.int32)
+        y = np.empty(count, dtype=np.int32)
+        filled = 0
+        for _ in range(SPAWN_ROUNDS):
+            if filled >= count:
+                break
+            need = count - filled
+            cx = self.player.x + self.rng.integers(-radius, radius + 1, need * 2)
+            cy = self.player.y + self.rng.integers(-radius, radius + 1, need * 2)
+            ok = self.world.walkable_at(cx, cy)
+            cx, cy = cx[ok][:need], cy[ok][:need]
+            x[filled:filled + len(cx)] = cx
+            y[filled:filled + len(cy)] = cy
+            filled += len(cx)
+        return x[:filled], y[:filled]
+
+    def view(self, index):
+        """第 index 只猫的 Cat 兼容视图（同一只猫总是同一个视图对象）"""
+        cat = self.views.get(index)
+        if cat is None:
+            cat = CatView(self, index)
+            self.views[index] = cat
+        return cat
+
+    def cats_at(self, x, y, radius=0):
+        """切比雪夫距离 radius 以内的猫的编号，从近到远"""
+        return cafe_cat_indices(self.entities.query_radius(x, y, radius))
+
+    def sync_entities(self):
+        """把这一步移动过的猫的位置写回空间哈希"""
+        moved = np.nonzero((self.x != self.synced_x) | (self.y != self.synced_y))[0]
+        for index, x, y in zip(moved.tolist(), self.x[moved].tolist(), self.y[moved].tolist()):
+            self.entities.move(("cafe_cat", index), x, y)
+        self.synced_x[moved] = self.x[moved]
+        self.synced_y[moved] = self.y[moved]
+
+    def remember_positions(self):
+        self.prev_x[:] = self.x
+        self.prev_y[:] = self.y
+
+    def simulate_ticks(self, ticks):
+        """跳过 ticks 个模拟步（无头批量模式），与 Cat.simulate_ticks 相同：只有饥饿值线性增长到上限
+        位置、行为和钓鱼都不模拟，猫停在跳过之前的地方"""
+        np.minimum(self.hunger + self.config.cat_hunger_rate * ticks, self.config.cat_max_hunger, out=self.hunger)
+
+    def update(self, world, player):
+        # 被举起、丢出或者在游泳的猫由各自的视图按 Cat 的规则单独更新
+        active = np.ones(self.count, dtype=bool)
+        for index, cat in self.views.items():
+            if cat.is_picked_up or cat.is_thrown or cat.is_swimming:
+                active[index] = False
+                Cat.update(cat, world, player)
+                if cat.is_picked_up:
+                    cat.x, cat.y = player.x, player.y
+
+        np.minimum(self.hunger + self.config.cat_hunger_rate, self.config.cat_max_hunger,
+                   out=self.hunger, where=active)
+
+        # 离玩家太远就不钓了
+        distance = np.maximum(np.abs(self.x - player.x), np.abs(self.y - player.y))
+        give_up = self.is_fishing & (distance > self.config.cat_follow_distance * 2)
+        self.is_fishing[give_up] = False
+        self.fishing_progress[give_up] = 0
+
+        # 决策：钓鱼中 > 冷却中 > 饿了试着去钓鱼 > 跟随
+        fishing = active & self.is_fishing
+        cooling = active & ~fishing & (self.fishing_cooldown > 0)
+        hungry = active & ~fishing & ~cooling & (self.hunger > 50)
+        self.continue_fishing(fishing)
+        self.fishing_cooldown[cooling] -= 1
+        started = self.tick(self.fishing_countdown, hungry, FISHING_START_CHANCE)
+        near_water = started[world.water_near_at(self.x[started], self.y[started])]
+        self.is_fishing[near_water] = True
+        self.fishing_progress[near_water] = 0
+        rolled = np.zeros(self.count, dtype=bool)
+        rolled[started] = True
+        self.follow(world, player, active & ~fishing & ~cooling & ~rolled & (self.behavior == FOLLOW))
+
+        # 离得太远就回到跟随
+        distance = np.maximum(np.abs(self.x - player.x), np.abs(self.y - player.y))
+        self.behavior[active & ~self.is_fishing & (distance > self.config.cat_follow_distance)] = FOLLOW
+        self.choose_behavior(active)
+
+        # 移动
+        ready = active & (self.move_cooldown <= 0)
+        self.follow(world, player, ready & (self.behavior == FOLLOW))
+        self.wander(world, ready & (self.behavior == WANDER))
+        self.move_cooldown[ready] = MOVE_COOLDOWN
+        self.move_cooldown[active & ~ready] -= 1
+
+        self.use_skills(world, active)
+        self.sync_entities()
+
+    def tick(self, countdown, mask, probability):
+        """mask 里的猫各掷一次骰（倒数减一），返回这一步事件发生的猫的编号"""
+        countdown[mask] -= 1
+        fired = np.nonzero(mask & (countdown <= 0))[0]
+        countdown[fired] = self.rng.geometric(probability, len(fired))
+        return fired
+
+    def continue_fishing(self, mask):
+        self.fishing_progress[mask] += 1
+        done = np.nonzero(mask & (self.fishing_progress >= FISHING_STEPS))[0]
+        caught = done[self.rng.random(len(done)) < self.config.cat_fishing_chance]
+        self.fish_caught[caught] += 1
+        self.hunger[caught] = np.maximum(0, self.hunger[caught] - 30)
+        self.is_fishing[done] = False
+        self.fishing_progress[done] = 0
+        self.fishing_cooldown[done] = FISHING_COOLDOWN
+
+    def follow(self, world, player, mask):
+        """朝玩家走一格，沿距离场绕开障碍（只有离得比跟随距离远的猫才走）"""
+        dx = player.x - self.x
+        dy = player.y - self.y
+        moving = mask & (np.maximum(np.abs(dx), np.abs(dy)) > self.config.cat_follow_distance)
+        if not moving.any():
+            return
+        indices = np.nonzero(moving)[0]
+        world.follow_field.set_target(player.x, player.y)
+        new_x, new_y, stepped = world.follow_field.steps(self.x[indices], self.y[indices])
+        self.x[indices[stepped]] = new_x[stepped]
+        self.y[indices[stepped]] = new_y[stepped]
+
+        # 不在距离场里的猫直线靠近
+        moving[indices[stepped]] = False
+        horizontal = np.abs(dx) > np.abs(dy)
+        new_x = self.x + np.where(horizontal, np.sign(dx), 0)
+        new_y = self.y + np.where(horizontal, 0, np.sign(dy))
+        self.move(world, moving, new_x, new_y)
+
+    def wander(self, world, mask):
+        """每被调用10次随机走一格"""
+        self.random_movement_counter[mask] += 1
+        moving = mask & (self.random_movement_counter >= WANDER_EVERY)
+        if not moving.any():
+            return
+        self.random_movement_counter[moving] = 0
+        step = DIRECTIONS[self.rng.integers(0, len(DIRECTIONS), self.count)]
+        self.move(world, moving, self.x + step[:, 0], self.y + step[:, 1])
+
+    def move(self, world, mask, new_x, new_y):
+        indices = np.nonzero(mask)[0]
+        ok = indices[world.walkable_at(new_x[indices], new_y[indices])]
+        self.x[ok] = new_x[ok]
+        self.y[ok] = new_y[ok]
+
+    def choose_behavior(self, active):
+        """按饥饿和好感加权，每步 1% 的概率换一种行为（Cat.choose_behavior 的向量化版本，见类说明）"""
+        changing = self.tick(self.behavior_countdown, active, BEHAVIOR_CHANGE_CHANCE)
+        if len(changing) == 0:
+            return
+        weights = np.tile(np.array([0.6, 0.3, 0.1]), (len(changing), 1))
+        weights[self.hunger[changing] < 30] = (0.4, 0.3, 0.3)
+        weights[self.affection[changing] > 80] += (0.2, -0.1, -0.1)
+        cumulative = np.cumsum(weights, axis=1)
+        roll = self.rng.random(len(changing)) * cumulative[:, -1]
+        self.behavior[changing] = (roll[:, None] >= cumulative).sum(axis=1)
+
+    def use_skills(self, world, active):
+        """浇水和促进生长：到点的猫才逐只处理周围的格子"""
+        watering = active & (self.skills & SKILL_BITS["watering"] != 0)
+        for index in self.tick(self.watering_countdown, watering, SKILL_CHANCE).tolist():
+            x, y = int(self.x[index]), int(self.y[index])
+            for dx in range(-1, 2):
+                for dy in range(-1, 2):
+                    if self.rng.random() < 0.3:
+                        world.water_soil(x + dx, y + dy)
+
+        boosting = active & (self.skills & SKILL_BITS["growth_boost"] != 0)
+        for index in self.tick(self.growth_boost_countdown, boosting, SKILL_CHANCE).tolist():
+            x, y = int(self.x[index]), int(self.y[index])
+            for dx in range(-2, 3):
+                for dy in range(-2, 3):
+                    tile = world.get_tile(x + dx, y + dy)
+                    if tile and tile.crop and not tile.crop.is_ready and self.rng.random() < 0.1:
+                        tile.crop.growth_days += 0.1
+
+    def draw(self, screen, alpha=1.0):
+        """绘制视口内的猫，返回 [(编号, 区域)]"""
+        world = self.world
+        view_x, view_y = world.view_x, world.view_y
+        visible = np.zeros(self.count, dtype=bool)
+        in_view = self.entities.query_rect(world.view_x_start, world.view_y_start,
+                                           world.view_x_start + self.config.view_width - 1,
+                                           world.view_y_start + self.config.view_height - 1)
+        visible[cafe_cat_indices(in_view)] = True
+        for index, cat in self.views.items():
+            if cat.is_picked_up or cat.is_thrown or cat.is_swimming:
+                visible[index] = False
+
+        indices = np.nonzero(visible)[0]
+        tile_size = self.config.tile_size
+        x = self.interpolate(self.prev_x[indices], self.x[indices], alpha)
+        y = self.interpolate(self.prev_y[indices], self.y[indices], alpha)
+        screen_x = np.rint((x - view_x) * tile_size).astype(int).tolist()
+        screen_y = np.rint((y - view_y) * tile_size).astype(int).tolist()
+
+        atlas = get_glyph_atlas(self.config)
+        area = atlas.get_rect(self.config.ascii_tiles["cat"], self.config.colors["cat"])
+        drawn = screen.blits([(atlas.surface, position, area) for position in zip(screen_x, screen_y)])
+        drawn = list(zip(indices.tolist(), drawn))
+
+        # 特殊状态的猫（丢出、游泳）用 Cat 自己的绘制
+        for index, cat in self.views.items():
+            if not visible[index] and not cat.is_picked_up:
+                rect = Cat.draw(cat, screen, alpha)
+                if rect:
+                    drawn.append((index, rect))
+        return drawn
+
+    @staticmethod
+    def interpolate(previous, current, alpha):
+        """向量化的 render.interpolate：跳跃不插值"""
+        delta = current - previous
+        return np.where(np.abs(delta) > 1, current, previous + delta * alpha)
+
+
+def cafe_cat_indices(items):
+    """从空间哈希的查询结果里挑出猫咖的猫的编号"""
+    return [item[1] for item in items if isinstance(item, tuple) and item[0] == "cafe_cat"]
+
+
+def _array_property(name):
+    def getter(self):
+        value = getattr(self.population, name)[self.index]
+        return value.item()
+
+    def setter(self, value):
+        getattr(self.population, name)[self.index] = value
+
+    return property(getter, setter)
+
+
+class SkillFlags:
+    """技能位掩码的 dict 式视图，让 Cat 的 self.skills["watering"] 写法照常工作"""
+
+    def __init__(self, population, index):
+        self.population = population
+        self.index = index
+
+    def __getitem__(self, name):
+        return bool(self.population.skills[self.index] & SKILL_BITS[name])
+
+    def __setitem__(self, name, value):
+        if value:
+            self.population.skills[self.index] |= SKILL_BITS[name]
+        else:
+            self.population.skills[self.index] &= ~SKILL_BITS[name] & 0xFF
+
+    def items(self):
+        return [(name, self[name]) for name in SKILLS]
+
+
+class CatView(Cat):
+    """种群里一只猫的 Cat 兼容视图：数值读写都落到种群数组上，其余状态（对话情绪等）存在视图里"""
+
+    def __init__(self, population, index):
+        self.population = population
+        self.index = index
+        # Cat.__init__ 会给位置、数值赋初始值，先保存数组里的真实值，初始化后再写回去
+        values = {name: getattr(population, name)[index].item() for name in ARRAY_FIELDS}
+        behavior, skills = population.behavior[index], population.skills[index]
+        Cat.__init__(self, population.config, population.player, population.clock, population.scheduler)
+        for name, value in values.items():
+            setattr(self, name, value)
+        population.behavior[index], population.skills[index] = behavior, skills
+
+    @property
+    def current_behavior(self):
+        return BEHAVIORS[self.population.behavior[self.index]]
+
+    @current_behavior.setter
+    def current_behavior(self, value):
+        # "play" 等种群不区分的行为按跟随处理
+        self.population.behavior[self.index] = BEHAVIORS.index(value) if value in BEHAVIORS else FOLLOW
+
+    @property
+    def skills(self):
+        return SkillFlags(self.population, self.index)
+
+    @skills.setter
+    def skills(self, value):
+        for name, unlocked in value.items():
+            self.skills[name] = unlocked
+
+
+for _name in ARRAY_FIELDS:
+    setattr(CatView, _name, _array_property(_name))
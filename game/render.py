@@ -0,0 +1,177 @@
+import numpy as np
+import pygame
+from game.glyph_atlas import get_glyph_atlas
+from game.util import get_font
+
+BLANK = -1    # 视口超出地图的格子，只涂黑
+UNKNOWN = -2  # 层上还没有画过（或刚滚动露出来）的格子
+
+
+def interpolate(previous, current, alpha):
+    """上一步与当前模拟步之间的绘制位置；跳跃（传送、被扔出去落地）不做插值"""
+    if abs(current - previous) > 1:
+        return current
+    return previous + (current - previous) * alpha
+
+
+class TerrainLayer:
+    """离屏地形层：只重绘变化过的瓦片，镜头移动时整体滚动
+
+    每帧先批量算出视口内所有瓦片的字形编号，与上一帧画在层上的编号比较，
+    只补画不同的格子。镜头平移时先 scroll 整个层，再补画露出来的行/列。
+    静止画面每帧只需要把层 blit 到屏幕上。
+    层比视口多一列一行：镜头停在两格之间时，视口右边和下边会露出半格。
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.tile_size = config.tile_size
+        self.view_width = config.view_width + 1
+        self.view_height = config.view_height + 1
+        self.surface = pygame.Surface((self.view_width * self.tile_size, self.view_height * self.tile_size))
+        self.origin = None  # 层左上角对应的世界坐标
+        self.glyphs = np.full((self.view_width, self.view_height), UNKNOWN, dtype=np.int32)
+        self.changed_rects = []  # 上一次 update 中层上变化过的区域
+
+    def matches(self, config):
+        return (self.tile_size, self.view_width - 1, self.view_height - 1) == \
+            (config.tile_size, config.view_width, config.view_height)
+
+    def update(self, world, view_x_start, view_y_start, glyph_arrays):
+        """让层与世界同步，返回层上变化过的区域（层坐标）"""
+        tile_size = self.tile_size
+
+        # 镜头移动：能滚动就滚动，否则整层作废；此时整层都算变化过
+        moved = self.origin != (view_x_start, view_y_start)
+        if moved:
+            if self.origin is not None:
+                self.scroll(view_x_start - self.origin[0], view_y_start - self.origin[1])
+            self.origin = (view_x_start, view_y_start)
+        self.changed_rects = [self.surface.get_rect()] if moved else []
+
+        # 视口内瓦片的字形编号（贴着地图边缘时视口可能比层小）
+        width = min(self.view_width, world.width - view_x_start)
+        height = min(self.view_height, world.height - view_y_start)
+        glyphs = np.full((self.view_width, self.view_height), BLANK, dtype=np.int32)
+        glyphs[:width, :height] = world.registry.glyph_ids(
+            *(world.grid.window(name, view_x_start, view_y_start, width, height) for name in glyph_arrays)
+        )
+
+        changed_i, changed_j = np.nonzero(glyphs != self.glyphs)
+        if len(changed_i) == 0:
+            return self.changed_rects
+
+        atlas = get_glyph_atlas(self.config, tile_size)
+        rects = world.registry.atlas_rects(atlas)
+        blit_sequence = []
+        for i, j in zip(changed_i.tolist(), changed_j.tolist()):
+            cell = pygame.Rect(i * tile_size, j * tile_size, tile_size, tile_size)
+            self.surface.fill((0, 0, 0), cell)
+            glyph = glyphs[i, j]
+            if glyph != BLANK:
+                # 字形裁剪在自己的格子里，补画时不会盖到相邻格子
+                area = rects[glyph]
+                blit_sequence.append((atlas.surface, cell.topleft,
+                                      (area.x, area.y, min(area.width, tile_size), min(area.height, tile_size))))
+            if not moved:
+                self.changed_rects.append(cell)
+        self.surface.blits(blit_sequence, doreturn=False)
+        self.glyphs = glyphs
+        return self.changed_rects
+
+    def scroll(self, dx, dy):
+        """镜头移动 (dx, dy) 格：层内容反向平移，露出的格子标记为未绘制"""
+        shifted = np.full_like(self.glyphs, UNKNOWN)
+        if abs(dx) < self.view_width and abs(dy) < self.view_height:
+            self.surface.scroll(-dx * self.tile_size, -dy * self.tile_size)
+            width, height = self.view_width - abs(dx), self.view_height - abs(dy)
+            src_i, dst_i = max(dx, 0), max(-dx, 0)
+            src_j, dst_j = max(dy, 0), max(-dy, 0)
+            shifted[dst_i:dst_i + width, dst_j:dst_j + height] = \
+                self.glyphs[src_i:src_i + width, src_j:src_j + height]
+        self.glyphs = shifted
+
+
+class DirtyRegions:
+    """脏矩形记录：收集每帧屏幕上变化过的区域，用 display.update(rects) 代替整屏 flip
+
+    每个绘制来源用一个 key 登记本帧画到的区域和状态，区域或状态与上一帧不同时新旧区域都算脏；
+    上一帧画过、这一帧没再画的来源（关掉的菜单、过期的通知）把旧区域补进来。
+    state 为 None 表示每帧都算变化（动画之类）。
+    """
+
+    OVERLAY_COLOR = (255, 0, 255)
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.rects = []
+        self.drawn = {}  # 上一帧：key -> (区域, 状态)
+        self.current = {}  # 本帧：key -> (区域, 状态)
+        self.overlay_rects = []  # 上一帧诊断叠加层画过的区域
+        self.full_update = True  # 第一帧（或窗口被覆盖后）整屏推送
+        self.font = None
+
+    def add(self, rect):
+        """直接登记一块本帧变化过的区域"""
+        self.rects.append(pygame.Rect(rect))
+
+    def track(self, key, rect, state=None):
+        """登记绘制来源 key 本帧画到的区域"""
+        if rect is None:
+            return
+        rect = pygame.Rect(rect)
+        previous = self.drawn.get(key)
+        self.current[key] = (rect, state)
+        if previous is None or state is None or previous != (rect, state):
+            self.rects.append(rect)
+            if previous is not None and previous[0] != rect:
+                self.rects.append(previous[0])
+
+    def track_gui(self, ui_manager):
+        """pygame_gui 元素：换了图像、移动或显隐变化时算脏；有焦点的元素（光标闪烁）每帧都算"""
+        for sprite in ui_manager.get_sprite_group().sprites():
+            self.track(("gui", id(sprite)), sprite.rect, (sprite.image, sprite.visible))
+        for element in ui_manager.get_focus_set() or ():
+            self.add(element.rect)
+
+    def invalidate(self):
+        """下一帧整屏推送（比如窗口被遮挡后重新露出）"""
+        self.full_update = True
+
+    def present(self, screen, show_overlay=False):
+        """把本帧画面推到显示器，返回推送的区域"""
+        # 上一帧画过、这一帧没画的来源
+        for key, (rect, state) in self.drawn.items():
+            if key not in self.current:
+                self.rects.append(rect)
+        self.drawn, self.current = self.current, {}
+        rects, self.rects = self.rects, []
+
+        # 诊断框画在本帧的脏矩形上，下一帧要连同文字一起擦掉
+        erase, self.overlay_rects = self.overlay_rects, []
+        if show_overlay:
+            rects.append(self.draw_overlay(screen, rects))
+            self.overlay_rects = list(rects)
+        rects += erase
+
+        if not self.enabled or self.full_update:
+            self.full_update = False
+            pygame.display.flip()
+            return [screen.get_rect()]
+        pygame.display.update(rects)
+        return rects
+
+    def draw_overlay(self, screen, rects):
+        """诊断叠加层：描出本帧的脏矩形，并显示数量和占屏幕的比例，返回文字所在区域"""
+        if self.font is None:
+            self.font = get_font(is_ascii=True, size=14)
+        for rect in rects:
+            pygame.draw.rect(screen, self.OVERLAY_COLOR, rect, 1)
+
+        screen_rect = screen.get_rect()
+        area = sum(rect.clip(screen_rect).width * rect.clip(screen_rect).height for rect in rects)
+        percent = 100 * area / (screen_rect.width * screen_rect.height)
+        mode = "dirty" if self.enabled else "flip"
+        label = self.font.render(f"{mode}: {len(rects)} rects, {percent:.1f}% of screen", True,
+                                 self.OVERLAY_COLOR, (0, 0, 0))
+        return screen.blit(label, (screen_rect.width - label.get_width() - 5, 5))
@@ -0,0 +1,65 @@
+import math
+import random
+
+
+class EventSampler:
+    """把“每步以概率 p 发生一次”的掷骰换成一次几何分布抽样
+
+    直接抽出距离下一次发生还要几步，之后每步只是倒数，轮到了才再抽一次。
+    只在原来会掷骰的那些步里调用 tick，统计上与逐步掷骰完全相同（几何分布无记忆）。
+    """
+
+    __slots__ = ("probability", "log_miss", "rng", "countdown")
+
+    def __init__(self, probability, rng=random):
+        self.probability = probability
+        self.log_miss = math.log1p(-probability) if 0 < probability < 1 else None
+        self.rng = rng
+        self.countdown = self.draw()
+
+    def draw(self):
+        """到下一次发生为止的步数（至少为1）"""
+        if self.probability >= 1:
+            return 1
+        if self.probability <= 0:
+            return math.inf
+        return int(math.log(1.0 - self.rng.random()) / self.log_miss) + 1
+
+    def tick(self):
+        """过了一步（相当于掷了一次骰），这一步事件发生就返回 True"""
+        self.countdown -= 1
+        if self.countdown > 0:
+            return False
+        self.countdown = self.draw()
+        return True
+
+
+class AliasTable:
+    """按权重抽取下标的别名表（Vose 方法）
+
+    建表 O(n)，之后每次抽样只要两个随机数和一次查表，O(1)，与权重个数无关。
+    """
+
+    __slots__ = ("probability", "alias")
+
+    def __init__(self, weights):
+        count = len(weights)
+        total = float(sum(weights))
+        scaled = [weight * count / total for weight in weights]
+        self.probability = [1.0] * count
+        self.alias = list(range(count))
+        small = [i for i, value in enumerate(scaled) if value < 1.0]
+        large = [i for i, value in enumerate(scaled) if value >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] -= 1.0 - scaled[less]
+            (small if scaled[more] < 1.0 else large).append(more)
+        # 剩下的（浮点误差）概率都按1处理
+
+    def draw(self, rng=random):
+        column = int(rng.random() * len(self.alias))
+        if rng.random() < self.probability[column]:
+            return column
+        return self.alias[column]
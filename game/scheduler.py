@@ -0,0 +1,57 @@
+import heapq
+import itertools
+
+
+class Timer:
+    """一个已登记的定时回调，cancel() 后不会再触发"""
+
+    __slots__ = ("when", "callback", "args", "cancelled")
+
+    def __init__(self, when, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class Scheduler:
+    """按游戏时间（时钟毫秒数）触发回调的调度器，最小堆实现
+
+    各个系统登记“某个时刻要做的事”，每个模拟步调用一次 run_due，
+    只处理到期的定时器，代价与到期数量成正比，而不是每帧挨个检查时间戳。
+    取消的定时器留在堆里，轮到时直接丢掉。
+    """
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.heap = []
+        self.sequence = itertools.count()  # 同一时刻的定时器按登记顺序触发
+
+    def call_at(self, when, callback, *args):
+        timer = Timer(when, callback, args)
+        heapq.heappush(self.heap, (when, next(self.sequence), timer))
+        return timer
+
+    def call_later(self, delay, callback, *args):
+        """delay 毫秒后调用 callback(*args)"""
+        return self.call_at(self.clock.get_ticks() + delay, callback, *args)
+
+    def run_due(self):
+        """触发所有到期的定时器，返回触发的个数"""
+        now = self.clock.get_ticks()
+        fired = 0
+        while self.heap and self.heap[0][0] <= now:
+            _, _, timer = heapq.heappop(self.heap)
+            if timer.cancelled:
+                continue
+            timer.cancelled = True
+            timer.callback(*timer.args)
+            fired += 1
+        return fired
+
+    def pending(self):
+        """堆里还没触发的定时器个数（含已取消、尚未丢弃的）"""
+        return len(self.heap)
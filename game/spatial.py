@@ -0,0 +1,69 @@
+class SpatialHash:
+    """均匀网格空间哈希：把实体按所在的 cell_size x cell_size 格子分桶
+
+    移动只在跨桶时改两个集合，O(1)；范围查询只看覆盖到的桶，
+    代价与附近的实体数成正比，而不是与实体总数成正比。
+    距离都用切比雪夫距离（与游戏里“相邻”“附近”的判定一致）。
+    """
+
+    def __init__(self, cell_size=8):
+        self.cell_size = cell_size
+        self.cells = {}  # (桶x, 桶y) -> 实体集合
+        self.positions = {}  # 实体 -> (x, y)
+
+    def cell(self, x, y):
+        return x // self.cell_size, y // self.cell_size
+
+    def insert(self, item, x, y):
+        self.positions[item] = (x, y)
+        self.cells.setdefault(self.cell(x, y), set()).add(item)
+
+    def remove(self, item):
+        position = self.positions.pop(item, None)
+        if position is None:
+            return
+        key = self.cell(*position)
+        bucket = self.cells[key]
+        bucket.discard(item)
+        if not bucket:
+            del self.cells[key]
+
+    def move(self, item, x, y):
+        """更新实体位置（不在表里就插入）"""
+        position = self.positions.get(item)
+        if position == (x, y):
+            return
+        if position is None or self.cell(*position) != self.cell(x, y):
+            self.remove(item)
+            self.insert(item, x, y)
+        else:
+            self.positions[item] = (x, y)
+
+    def position(self, item):
+        return self.positions.get(item)
+
+    def __contains__(self, item):
+        return item in self.positions
+
+    def query_rect(self, x0, y0, x1, y1):
+        """左上角 (x0, y0)、右下角 (x1, y1)（都包含）矩形内的实体"""
+        cx0, cy0 = self.cell(x0, y0)
+        cx1, cy1 = self.cell(x1, y1)
+        found = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for item in self.cells.get((cx, cy), ()):
+                    x, y = self.positions[item]
+                    if x0 <= x <= x1 and y0 <= y <= y1:
+                        found.append(item)
+        return found
+
+    def query_radius(self, x, y, radius):
+        """与 (x, y) 的切比雪夫距离不超过 radius 的实体，按距离从近到远排列"""
+        found = self.query_rect(x - radius, y - radius, x + radius, y + radius)
+        found.sort(key=lambda item: self.distance(item, x, y))
+        return found
+
+    def distance(self, item, x, y):
+        px, py = self.positions[item]
+        return max(abs(px - x), abs(py - y))
@@ -0,0 +1,88 @@
+import numpy as np
+
+# 作物生长阶段的分界（生长进度百分比），对应 crop_stage_1/2/3
+CROP_STAGE_THRESHOLDS = (0.33, 0.66)
+
+# 作物和采集物编码 0 表示“没有”
+NO_CROP = 0
+NO_FORAGE = 0
+
+
+class TileRegistry:
+    """瓦片类型注册表：类型名 <-> 整数编码，以及按编码查表得到的符号、颜色和属性
+
+    所有表都由 Config.tile_types / ascii_tiles / colors 生成，新增地形只需改配置。
+    绘制用“字形编号”表示 (符号, 颜色) 组合，同一组合只占一个编号。
+    """
+
+    def __init__(self, config):
+        self.names = list(config.tile_types.keys())
+        self.codes = {name: code for code, name in enumerate(self.names)}
+
+        specs = [config.tile_types[name] for name in self.names]
+        self.walkable = np.array([spec["walkable"] for spec in specs], dtype=bool)
+        self.soil = np.array([spec.get("soil", False) for spec in specs], dtype=bool)
+
+        # 作物/采集物名称与编码的对应关系（编码从1开始）
+        self.crop_names = [None] + list(config.crop_types.keys())
+        self.crop_codes = {name: code for code, name in enumerate(self.crop_names) if name}
+        self.crop_growth_time = np.array(
+            [1] + [config.crop_types[name]["growth_time"] for name in self.crop_names[1:]],
+            dtype=np.float32
+        )
+        self.forage_names = [None] + list(config.forage_types.keys())
+        self.forage_codes = {name: code for code, name in enumerate(self.forage_names) if name}
+
+        # 字形表
+        self.glyphs = []  # 字形编号 -> (符号, 颜色)
+        self.glyph_codes = {}  # (符号, 颜色) -> 字形编号
+        symbols, colors = config.ascii_tiles, config.colors
+        self.type_glyph = np.array(
+            [self.glyph(symbols[name], colors[spec["color"]]) for name, spec in zip(self.names, specs)],
+            dtype=np.uint16
+        )
+        self.forage_glyph = self.glyph(symbols["forage"], colors["forage"])
+        self.crop_stage_glyph = np.array(
+            [self.glyph(symbols[f"crop_stage_{stage}"], colors["crop"])
+             for stage in range(1, len(CROP_STAGE_THRESHOLDS) + 2)],
+            dtype=np.uint16
+        )
+        self.crop_ready_glyph = self.glyph(symbols["crop_ready"], colors["crop"])
+
+        self.glyph_rects = {}  # 图集 -> 按字形编号排列的子区域列表
+
+    def glyph(self, symbol, color):
+        """登记一个 (符号, 颜色) 组合，返回它的字形编号"""
+        key = (symbol, tuple(color))
+        if key not in self.glyph_codes:
+            self.glyph_codes[key] = len(self.glyphs)
+            self.glyphs.append(key)
+        return self.glyph_codes[key]
+
+    def glyph_ids(self, types, forage, crop, crop_growth, crop_ready):
+        """批量计算字形编号：地形 < 采集物 < 作物（后者覆盖前者）"""
+        glyphs = self.type_glyph[types]
+        glyphs[forage != NO_FORAGE] = self.forage_glyph
+
+        planted = crop != NO_CROP
+        if planted.any():
+            progress = crop_growth[planted] / self.crop_growth_time[crop[planted]]
+            stage = np.searchsorted(CROP_STAGE_THRESHOLDS, progress, side="right")
+            stage_glyphs = self.crop_stage_glyph[stage]
+            stage_glyphs[crop_ready[planted]] = self.crop_ready_glyph
+            glyphs[planted] = stage_glyphs
+        return glyphs
+
+    def glyph_id(self, grid, i, j):
+        """单个瓦片的字形编号"""
+        index = (slice(i, i + 1), slice(j, j + 1))
+        return int(self.glyph_ids(grid.type[index], grid.forage[index], grid.crop[index],
+                                  grid.crop_growth[index], grid.crop_ready[index])[0, 0])
+
+    def atlas_rects(self, atlas):
+        """字形编号 -> 图集子区域 的列表，每个图集只生成一次"""
+        rects = self.glyph_rects.get(atlas)
+        if rects is None:
+            rects = [atlas.get_rect(symbol, color) for symbol, color in self.glyphs]
+            self.glyph_rects[atlas] = rects
+        return rects
@@ -1,7 +1,8 @@
-import pygame
+from game.clock import RealClock
 
 class TimeSystem:
-    def __init__(self):
+    def __init__(self, clock=None):
+        self.clock = clock or RealClock()
         self.minutes = 6 * 60  # Start at 6:00 AM
         self.day = 1
         self.season = "spring"
@@ -19,12 +20,14 @@ class TimeSystem:
         
         # Time tracking
         self.real_time_accumulator = 0
-        self.last_time = pygame.time.get_ticks()
+        self.last_time = self.clock.get_ticks()
         self.time_scale = 16  # 16:1 ratio (real seconds to game minutes)
     
-    def update(self):
-        current_time = pygame.time.get_ticks()
-        delta_time = (current_time - self.last_time) / 1000.0  # Convert to seconds
+    def update(self, delta_time=None):
+        # delta_time: 固定模拟步长（秒）；不传则按真实经过的时间
+        current_time = self.clock.get_ticks()
+        if delta_time is None:
+            delta_time = (current_time - self.last_time) / 1000.0  # Convert to seconds
         self.last_time = current_time
         
         # Accumulate real time and convert to game time
@@ -54,6 +57,15 @@ class TimeSystem:
             if self.season == "spring":
                 self.year += 1
     
+    def simulate_days(self, days):
+        """一次性前进 days 天（与调用 days 次 advance_day 结果相同）"""
+        season_count = len(self.seasons)
+        index = ((self.year - 1) * season_count + self.seasons.index(self.season)) * self.season_days \
+            + self.day - 1 + days
+        self.day = index % self.season_days + 1
+        self.season = self.seasons[index // self.season_days % season_count]
+        self.year = index // (self.season_days * season_count) + 1
+    
     def get_time_string(self):
         hours = self.minutes // 60
         mins = self.minutes % 60
@@ -1,15 +1,23 @@
 import pygame
-from game.util import get_font
+from game.util import get_font, render_text, overlay_pool
+from game.glyph_atlas import get_glyph_atlas
+from game.render import DirtyRegions
+from game.bindings import BindingSet
+from game.scheduler import Scheduler
 import pygame_gui
-import time
 
 class UI:
-    def __init__(self, screen, config, player, cat, time_system):
+    def __init__(self, screen, config, player, cat, time_system, dirty_regions=None, scheduler=None):
         self.screen = screen
         self.config = config
         self.player = player
         self.cat = cat
         self.time_system = time_system
+        self.clock = time_system.clock  # 与模拟共用一个时钟，暂停/快进时通知和动画一起停/快
+        self.scheduler = scheduler or Scheduler(self.clock)  # 通知过期用
+        
+        # 每个界面元素把自己画到的区域登记到这里（脏矩形模式用）
+        self.dirty_regions = dirty_regions or DirtyRegions()
         
         # 交互菜单
         self.show_interaction_menu = False
@@ -100,6 +108,22 @@ class UI:
                 container=self.debug_panel
             ) for i in range(5)
         ]
+        
+        # 控件绑定：每帧刷新，只有值变了才 set_text（避免 pygame_gui 重新排版和渲染文字）
+        self.debug_messages = []
+        self.status_bindings = BindingSet()
+        self.status_bindings.bind_text(self.energy_label,
+                                       lambda: f"能量: {int(self.player.energy)}/{self.config.max_energy}")
+        self.status_bindings.bind_text(self.money_label, lambda: f"金钱: ${self.player.money}")
+        self.status_bindings.bind_text(self.time_label, self.time_system.get_time_string)
+        self.status_bindings.bind_text(self.date_label, self.time_system.get_date_string)
+        self.status_bindings.bind_text(self.controls_label,
+                                       lambda: "按键说明: [WASD]移动 [E]交互 [I]背包 [T]对话 [Enter]睡觉")
+        self.debug_bindings = BindingSet()
+        for i, label in enumerate(self.debug_labels):
+            self.debug_bindings.bind_text(
+                label, lambda i=i: self.debug_messages[i] if i < len(self.debug_messages) else ""
+            )
     
     def add_notification(self, message, duration=180):  # 3 seconds at 60 FPS
         panel_width, panel_height = 300, 40
@@ -115,8 +139,13 @@ class UI:
             manager=self.ui_manager,
             container=panel
         )
-        expire_time = time.time() + duration/60.0  # duration帧转秒
+        expire_time = self.clock.get_ticks() + duration * 1000 / 60  # duration帧转毫秒
         self.active_notifications.append((panel, expire_time))
+        self.scheduler.call_at(expire_time, self.expire_notification, panel, expire_time)
+    
+    def expire_notification(self, panel, expire_time):
+        panel.kill()
+        self.active_notifications.remove((panel, expire_time))
     
     def toggle_inventory(self):
         if self.inventory_window is not None:
@@ -295,27 +324,29 @@ class UI:
         self.input_rect.y = self.screen.get_height() - 100
         
         # 绘制半透明背景
-        bg_surface = pygame.Surface((self.input_rect.width + 20, self.input_rect.height + 20))
-        bg_surface.set_alpha(200)
-        bg_surface.fill((30, 30, 30))
+        bg_surface = overlay_pool.get((self.input_rect.width + 20, self.input_rect.height + 20), 200, (30, 30, 30))
         self.screen.blit(bg_surface, (self.input_rect.x - 10, self.input_rect.y - 10))
         
+        # 提示文字在输入框左侧，整行都算进去；光标会闪烁，每帧都算脏
+        self.dirty_regions.track("text_input", (0, self.input_rect.y - 10, self.screen.get_width(),
+                                                self.input_rect.height + 20))
+        
         # 绘制输入框边框
         border_color = (255, 255, 255) if self.input_active else (150, 150, 150)
         pygame.draw.rect(self.screen, border_color, self.input_rect, 2)
         
         # 绘制提示文本
         prompt_text = "对猫咪说: "
-        prompt_surface = self.font_medium.render(prompt_text, True, (255, 255, 255))
+        prompt_surface = render_text(self.font_medium, prompt_text, True, (255, 255, 255))
         self.screen.blit(prompt_surface, (self.input_rect.x - prompt_surface.get_width() - 10, self.input_rect.y + 5))
         
         # 绘制输入的文本
         if self.input_text:
-            text_surface = self.font_medium.render(self.input_text, True, (255, 255, 255))
+            text_surface = render_text(self.font_medium, self.input_text, True, (255, 255, 255))
             self.screen.blit(text_surface, (self.input_rect.x + 5, self.input_rect.y + 5))
         
         # 绘制光标
-        if self.input_active and int(pygame.time.get_ticks() / 500) % 2 == 0:
+        if self.input_active and int(self.clock.get_ticks() / 500) % 2 == 0:
             # 计算光标位置
             cursor_pos = self.font_medium.size(self.input_text)[0]
             pygame.draw.line(self.screen, (255, 255, 255),
@@ -323,12 +354,12 @@ class UI:
                            (self.input_rect.x + cursor_pos + 5, self.input_rect.y + self.input_rect.height - 5), 2)
                            
     def draw(self, current_tool):
+        # 分辨率变了才重建遮罩表面
+        overlay_pool.set_resolution(self.screen.get_size())
+        
         # Draw status bar at the bottom
         self.draw_status_bar(current_tool)
         
-        # Draw notifications
-        self.draw_notifications()
-        
         # Draw inventory if open
         if self.show_inventory:
             self.draw_inventory()
@@ -349,6 +380,13 @@ class UI:
             self.draw_fishing_minigame()
     
     def draw_status_bar(self, current_tool):
+        # 状态栏内容没变就不算脏
+        self.dirty_regions.track(
+            "status_bar", (0, self.screen.get_height() - 60, self.screen.get_width(), 60),
+            (int(self.player.energy), self.player.money, self.time_system.get_time_string(),
+             self.time_system.get_date_string(), current_tool)
+        )
+        
         # Draw a black bar at the bottom
         pygame.draw.rect(self.screen, (0, 0, 0), 
                          (0, self.screen.get_height() - 60, self.screen.get_width(), 60))
@@ -370,10 +408,10 @@ class UI:
                          (10, self.screen.get_height() - 55, energy_width, 15))
         
         # Texts - 使用中文字体
-        energy_surface = self.font_small.render(energy_text, True, self.config.colors["text"])
-        money_surface = self.font_small.render(money_text, True, self.config.colors["text"])
-        time_surface = self.font_small.render(time_text, True, self.config.colors["time"])
-        date_surface = self.font_small.render(date_text, True, self.config.colors["time"])
+        energy_surface = render_text(self.font_small, energy_text, True, self.config.colors["text"])
+        money_surface = render_text(self.font_small, money_text, True, self.config.colors["text"])
+        time_surface = render_text(self.font_small, time_text, True, self.config.colors["time"])
+        date_surface = render_text(self.font_small, date_text, True, self.config.colors["time"])
         
         # Position and draw texts
         self.screen.blit(energy_surface, (165, self.screen.get_height() - 55))
@@ -391,22 +429,14 @@ class UI:
             }.get(current_tool, current_tool.capitalize())
             
             tool_text = f"工具: {tool_name}"
-            tool_surface = self.font_small.render(tool_text, True, self.config.colors["text"])
+            tool_surface = render_text(self.font_small, tool_text, True, self.config.colors["text"])
             self.screen.blit(tool_surface, (350, self.screen.get_height() - 45))
     
-    def draw_notifications(self):
-        # 清理过期通知
-        now = time.time()
-        for panel, expire in self.active_notifications[:]:
-            if now > expire:
-                panel.kill()
-                self.active_notifications.remove((panel, expire))
-    
     def draw_inventory(self):
+        self.dirty_regions.track("inventory", self.screen.get_rect(), tuple(self.player.inventory.items()))
+        
         # Semi-transparent background
-        overlay = pygame.Surface((self.screen.get_width(), self.screen.get_height()))
-        overlay.set_alpha(200)
-        overlay.fill((0, 0, 0))
+        overlay = overlay_pool.get(self.screen.get_size(), 200, (0, 0, 0))
         self.screen.blit(overlay, (0, 0))
         
         # Inventory panel
@@ -421,7 +451,7 @@ class UI:
                          (panel_x, panel_y, panel_width, panel_height), 2)
         
         # Title (使用中文)
-        title_surface = self.font_large.render("物品栏", True, self.config.colors["text"])
+        title_surface = render_text(self.font_large, "物品栏", True, self.config.colors["text"])
         self.screen.blit(title_surface, (panel_x + (panel_width - title_surface.get_width()) // 2, panel_y + 10))
         
         # 物品名称的中文翻译
@@ -450,7 +480,7 @@ class UI:
                 # 使用翻译后的名称
                 display_name = item_translations.get(item_name, item_name.replace('_', ' ').title())
                 item_text = f"{display_name}: {count}"
-                item_surface = self.font_medium.render(item_text, True, self.config.colors["text"])
+                item_surface = render_text(self.font_medium, item_text, True, self.config.colors["text"])
                 self.screen.blit(item_surface, (items_x, items_y))
                 items_y += 25
                 
@@ -463,18 +493,14 @@ class UI:
         """绘制猫咪信息"""
         if self.cat.is_picked_up:
             # 如果猫被举起，在玩家上方绘制猫
-            world_view_x = self.player.world.view_x_start
-            world_view_y = self.player.world.view_y_start
-            
-            # 计算玩家位置
-            player_screen_x = (self.player.x - world_view_x) * self.config.tile_size
-            player_screen_y = (self.player.y - world_view_y) * self.config.tile_size
+            # 玩家这一帧画在哪里（插值后的位置）
+            player_screen_x, player_screen_y = self.player.screen_position
             
             # 在玩家头上绘制猫
-            from game.util import get_font
-            font = get_font(is_ascii=True, size=self.config.tile_size)
-            cat_surface = font.render(self.cat.symbol, True, self.cat.color)
-            self.screen.blit(cat_surface, (player_screen_x, player_screen_y - self.config.tile_size))
+            atlas = get_glyph_atlas(self.config)
+            drawn = atlas.blit(self.screen, self.cat.symbol, self.cat.color,
+                               (player_screen_x, player_screen_y - self.config.tile_size))
+            self.dirty_regions.track("carried_cat", drawn)
             
         # 绘制猫咪状态信息
         hunger_text = f"猫咪饥饿: {int(self.cat.hunger)}/{self.cat.max_hunger}"
@@ -487,14 +513,13 @@ class UI:
         # 绘制背景
         bg_width = max(self.font_small.size(hunger_text)[0], self.font_small.size(affection_text)[0]) + 20
         bg_height = 50
-        s = pygame.Surface((bg_width, bg_height))
-        s.set_alpha(150)
-        s.fill((0, 0, 0))
+        s = overlay_pool.get((bg_width, bg_height), 150, (0, 0, 0))
         self.screen.blit(s, (info_x, info_y))
+        self.dirty_regions.track("cat_info", (info_x, info_y, bg_width, bg_height), (hunger_text, affection_text))
         
         # 绘制文本
-        hunger_surface = self.font_small.render(hunger_text, True, (255, 255, 255))
-        affection_surface = self.font_small.render(affection_text, True, (255, 255, 255))
+        hunger_surface = render_text(self.font_small, hunger_text, True, (255, 255, 255))
+        affection_surface = render_text(self.font_small, affection_text, True, (255, 255, 255))
         
         self.screen.blit(hunger_surface, (info_x + 10, info_y + 10))
         self.screen.blit(affection_surface, (info_x + 10, info_y + 30))
@@ -511,10 +536,10 @@ class UI:
         menu_y = (self.screen.get_height() - menu_height) // 2
         
         # 绘制半透明背景
-        s = pygame.Surface((menu_width, menu_height))
-        s.set_alpha(200)
-        s.fill((50, 50, 50))
+        s = overlay_pool.get((menu_width, menu_height), 200, (50, 50, 50))
         self.screen.blit(s, (menu_x, menu_y))
+        self.dirty_regions.track("interaction_menu", (menu_x, menu_y, menu_width, menu_height),
+                                 (tuple(self.interaction_options), self.selected_interaction))
         
         # 绘制边框
         pygame.draw.rect(self.screen, (200, 200, 200), 
@@ -522,34 +547,24 @@ class UI:
         
         # 绘制标题
         title = "猫咪互动"
-        title_surface = self.font_medium.render(title, True, (255, 255, 255))
+        title_surface = render_text(self.font_medium, title, True, (255, 255, 255))
         title_x = menu_x + (menu_width - title_surface.get_width()) // 2
         self.screen.blit(title_surface, (title_x, menu_y + 10))
         
         # 绘制选项
         for i, option in enumerate(self.interaction_options):
             color = (255, 255, 0) if i == self.selected_interaction else (255, 255, 255)
-            option_surface = self.font_small.render(option, True, color)
+            option_surface = render_text(self.font_small, option, True, color)
             option_x = menu_x + 20
             option_y = menu_y + 40 + i * 30
             self.screen.blit(option_surface, (option_x, option_y))
     
     def update_status_bar(self):
-        self.energy_label.set_text(f"能量: {int(self.player.energy)}/{self.config.max_energy}")
-        self.money_label.set_text(f"金钱: ${self.player.money}")
-        self.time_label.set_text(self.time_system.get_time_string())
-        self.date_label.set_text(self.time_system.get_date_string())
-        self.controls_label.set_text("按键说明: [WASD]移动 [E]交互 [I]背包 [T]对话 [Enter]睡觉")
-        # 清理过期通知
-        now = time.time()
-        for panel, expire in self.active_notifications[:]:
-            if now > expire:
-                panel.kill()
-                self.active_notifications.remove((panel, expire)) 
+        self.status_bindings.refresh()
     
     def update_debug_panel(self, debug_messages):
-        for i, label in enumerate(self.debug_labels):
-            label.set_text(debug_messages[i] if i < len(debug_messages) else "")
+        self.debug_messages = debug_messages
+        self.debug_bindings.refresh()
     
     def draw_fishing_minigame(self):
         """绘制钓鱼小游戏界面"""
@@ -562,10 +577,9 @@ class UI:
         panel_x = (self.screen.get_width() - panel_width) // 2
         panel_y = (self.screen.get_height() - panel_height) // 2
         
-        # 绘制半透明背景
-        overlay = pygame.Surface((self.screen.get_width(), self.screen.get_height()))
-        overlay.set_alpha(150)
-        overlay.fill((0, 0, 0))
+        # 绘制半透明背景（小游戏每帧都在动）
+        self.dirty_regions.track("fishing_minigame", self.screen.get_rect())
+        overlay = overlay_pool.get(self.screen.get_size(), 150, (0, 0, 0))
         self.screen.blit(overlay, (0, 0))
         
         # 绘制主面板
@@ -576,7 +590,7 @@ class UI:
         
         # 标题
         title = "钓鱼小游戏"
-        title_surface = self.font_large.render(title, True, (255, 255, 255))
+        title_surface = render_text(self.font_large, title, True, (255, 255, 255))
         title_x = panel_x + (panel_width - title_surface.get_width()) // 2
         self.screen.blit(title_surface, (title_x, panel_y + 10))
         
@@ -597,7 +611,7 @@ class UI:
         
         # 耐力条标签
         stamina_text = f"鱼的体力: {int(self.player.fish_stamina)}/{self.player.fish_max_stamina}"
-        stamina_surface = self.font_medium.render(stamina_text, True, (255, 255, 255))
+        stamina_surface = render_text(self.font_medium, stamina_text, True, (255, 255, 255))
         self.screen.blit(stamina_surface, (stamina_x, stamina_y - 25))
         
         # 绘制张力条
@@ -624,7 +638,7 @@ class UI:
         
         # 张力条标签
         tension_text = f"鱼线张力: {int(self.player.tension)}/100"
-        tension_surface = self.font_medium.render(tension_text, True, (255, 255, 255))
+        tension_surface = render_text(self.font_medium, tension_text, True, (255, 255, 255))
         self.screen.blit(tension_surface, (tension_x, tension_y - 25))
         
         # 绘制力度条
@@ -650,14 +664,14 @@ class UI:
         
         # 力度条标签
         power_text = f"收杆力度: {int(self.player.reel_power)}/100"
-        power_surface = self.font_medium.render(power_text, True, (255, 255, 255))
+        power_surface = render_text(self.font_medium, power_text, True, (255, 255, 255))
         self.screen.blit(power_surface, (power_x, power_y - 25))
         
         # 绘制鱼的方向指示
         direction_y = panel_y + 200
         direction_names = ["↑ 上", "→ 右", "↓ 下", "← 左"]
         direction_text = f"鱼游向: {direction_names[self.player.fish_direction]}"
-        direction_surface = self.font_medium.render(direction_text, True, (255, 255, 100))
+        direction_surface = render_text(self.font_medium, direction_text, True, (255, 255, 100))
         direction_x = panel_x + (panel_width - direction_surface.get_width()) // 2
         self.screen.blit(direction_surface, (direction_x, direction_y))
         
@@ -669,13 +683,13 @@ class UI:
         ]
         
         for i, instruction in enumerate(instructions):
-            instruction_surface = self.font_small.render(instruction, True, (200, 200, 200))
+            instruction_surface = render_text(self.font_small, instruction, True, (200, 200, 200))
             instruction_x = panel_x + 20
             instruction_y = panel_y + 230 + i * 18
             self.screen.blit(instruction_surface, (instruction_x, instruction_y))
         
         # 绘制时间进度条
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
         time_elapsed = current_time - self.player.minigame_timer
         time_progress = min(1.0, time_elapsed / self.player.max_minigame_time)
         
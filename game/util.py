@@ -1,5 +1,6 @@
 import pygame
 import os
+from collections import OrderedDict
 
 def load_chinese_font(size=24):
     """加载中文字体，尝试多种方法"""
@@ -64,4 +65,97 @@ def get_font(is_ascii=False, size=24):
         else:
             font_cache[cache_key] = load_chinese_font(size)
     
-    return font_cache[cache_key] 
\ No newline at end of file
+    return font_cache[cache_key] 
+
+class TextCache:
+    """渲染好的文字表面的 LRU 缓存，键为 (字体, 文字, 颜色, 抗锯齿, 背景色)
+
+    中文字形渲染很慢，界面上大部分文字每帧都一样，命中缓存后只需要一次 blit。
+    条目数和占用内存都有上限，超出时淘汰最久没用过的条目。
+    """
+
+    def __init__(self, max_entries=512, max_bytes=8 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()
+        self.nbytes = 0  # 缓存中所有表面的像素内存
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, antialias, color, background=None):
+        """与 font.render 参数相同；返回的表面是共享的，不要修改它"""
+        key = (font, text, antialias, tuple(color), tuple(background) if background else None)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color, background)
+        self.surfaces[key] = surface
+        self.nbytes += self.surface_bytes(surface)
+        while len(self.surfaces) > self.max_entries or (self.nbytes > self.max_bytes and len(self.surfaces) > 1):
+            _, evicted = self.surfaces.popitem(last=False)
+            self.nbytes -= self.surface_bytes(evicted)
+        return surface
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+    def clear(self):
+        self.surfaces.clear()
+        self.nbytes = 0
+
+    def stats(self):
+        """命中/未命中次数、条目数和占用内存（字节）"""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.surfaces), "bytes": self.nbytes}
+
+
+# 全局文字缓存
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, color, background=None):
+    """经过全局缓存的 font.render"""
+    return text_cache.render(font, text, antialias, color, background)
+
+
+class OverlayPool:
+    """半透明遮罩表面池，按 (尺寸, 透明度, 颜色) 复用预先设置好的表面
+
+    界面上的遮罩和面板背景每帧都是同样的几种，复用后不再每帧分配（全屏遮罩有好几 MB）。
+    屏幕分辨率变化时整池重建。
+    """
+
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self.surfaces = {}
+        self.resolution = None
+        self.allocations = 0  # 累计新建的表面数
+
+    def set_resolution(self, size):
+        """分辨率变了就丢掉所有旧表面"""
+        size = tuple(size)
+        if size != self.resolution:
+            self.surfaces.clear()
+            self.resolution = size
+
+    def get(self, size, alpha, color):
+        """取一个已经 set_alpha/fill 好的表面；它是共享的，只能用来 blit"""
+        key = (tuple(size), alpha, tuple(color))
+        surface = self.surfaces.get(key)
+        if surface is None:
+            if len(self.surfaces) >= self.max_entries:
+                del self.surfaces[next(iter(self.surfaces))]
+            surface = pygame.Surface(key[0])
+            surface.set_alpha(alpha)
+            surface.fill(color)
+            self.surfaces[key] = surface
+            self.allocations += 1
+        return surface
+
+
+# 全局遮罩表面池
+overlay_pool = OverlayPool()
@@ -0,0 +1,222 @@
+import random
+import numpy as np
+from game.sampler import AliasTable
+
+MAX_DISTANCE = 32  # 距离场只算到这么远，更远的一律记为 MAX_DISTANCE + 1
+FAR = MAX_DISTANCE + 1
+
+# 八个方向：先上下左右，再斜角
+OFFSETS_8 = ((-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, -1), (-1, 1), (1, 1))
+
+CATCH_TRIES = 8  # 拒绝采样最多试几次，都被拒绝就算没钓到
+
+
+def dilate(mask):
+    """布尔数组向八个方向各扩一格"""
+    rows = mask.copy()
+    rows[1:, :] |= mask[:-1, :]
+    rows[:-1, :] |= mask[1:, :]
+    grown = rows.copy()
+    grown[:, 1:] |= rows[:, :-1]
+    grown[:, :-1] |= rows[:, 1:]
+    return grown
+
+
+def distance_field(sources, passable):
+    """多源 BFS（八方向）：sources 为0，只往 passable 的格子扩展，按波前整层推进"""
+    distance = np.full(sources.shape, FAR, dtype=np.int16)
+    distance[sources] = 0
+    reached = sources.copy()
+    frontier = sources
+    for step in range(1, MAX_DISTANCE + 1):
+        frontier = dilate(frontier) & passable & ~reached
+        if not frontier.any():
+            break
+        distance[frontier] = step
+        reached |= frontier
+    return distance
+
+
+def label_bodies(water):
+    """把水面按八连通分成一个个水体（河、各个湖）
+
+    返回 (labels, sizes)：labels 里 0 表示不是水，水体 k 的格子数是 sizes[k - 1]。
+    """
+    width, height = water.shape
+    cells = water.tolist()
+    labels = [[0] * height for _ in range(width)]
+    sizes = []
+    for x, y in np.argwhere(water).tolist():
+        if labels[x][y]:
+            continue
+        label = len(sizes) + 1
+        labels[x][y] = label
+        stack = [(x, y)]
+        size = 0
+        while stack:
+            cx, cy = stack.pop()
+            size += 1
+            for dx, dy in OFFSETS_8:
+                nx, ny = cx + dx, cy + dy
+                if 0 <= nx < width and 0 <= ny < height and cells[nx][ny] and not labels[nx][ny]:
+                    labels[nx][ny] = label
+                    stack.append((nx, ny))
+        sizes.append(size)
+    return np.array(labels, dtype=np.int32).reshape(water.shape), sizes
+
+
+class WaterFields:
+    """预先算好的两张距离场，水边相关的查询都变成 O(1) 查表
+
+    water_distance：到最近水面的切比雪夫距离（<= 1 就是周围 3x3 有水，可以钓鱼）
+    land_distance：在水里游到最近的岸上要几步（只穿过水面，非水格子都为0）
+    labels：水体编号（见 label_bodies），生成时算一次。
+    瓦片类型变化时，只有水和非水互相变了才重算附近的窗口。
+    """
+
+    def __init__(self, world):
+        self.world = world
+        self.registry = world.registry
+        self.water_code = self.registry.codes["water"]
+        types = world.grid.type
+        self.water_distance, self.land_distance = self.compute(types)
+        self.labels, self.body_sizes = label_bodies(types == self.water_code)
+        self.refreshes = 0
+        world.add_tile_listener(self.on_tile_changed)
+
+    def compute(self, types):
+        water = types == self.water_code
+        return distance_field(water, np.ones_like(water)), distance_field(~water, water)
+
+    def on_tile_changed(self, x, y):
+        was_water = self.water_distance[x, y] == 0
+        if was_water == (self.world.grid.type[x, y] == self.water_code):
+            return  # 比如草地耕成土地，距离场不变
+        self.relabel(x, y, not was_water)
+        self.refresh(x, y)
+
+    def relabel(self, x, y, is_water):
+        """新挖的水并入相邻的水体（不相邻的不算任何水体）；填掉的水不再属于水体，不拆分原来的水体"""
+        label = 0
+        if is_water:
+            width, height = self.labels.shape
+            for dx, dy in OFFSETS_8:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height and self.labels[nx, ny]:
+                    label = self.labels[nx, ny]
+                    break
+        self.labels[x, y] = label
+
+    def refresh(self, x, y):
+        """(x, y) 变了以后，只有 MAX_DISTANCE 以内的格子距离会变；多算一圈让窗口边缘的源也算进来"""
+        width, height = self.water_distance.shape
+        x0, x1 = max(0, x - 2 * MAX_DISTANCE), min(width, x + 2 * MAX_DISTANCE + 1)
+        y0, y1 = max(0, y - 2 * MAX_DISTANCE), min(height, y + 2 * MAX_DISTANCE + 1)
+        water_distance, land_distance = self.compute(self.world.grid.type[x0:x1, y0:y1])
+
+        i0, i1 = max(x0, x - MAX_DISTANCE), min(x1, x + MAX_DISTANCE + 1)
+        j0, j1 = max(y0, y - MAX_DISTANCE), min(y1, y + MAX_DISTANCE + 1)
+        inner = (slice(i0 - x0, i1 - x0), slice(j0 - y0, j1 - y0))
+        self.water_distance[i0:i1, j0:j1] = water_distance[inner]
+        self.land_distance[i0:i1, j0:j1] = land_distance[inner]
+        self.refreshes += 1
+
+    def can_fish(self, x, y):
+        return bool(self.water_distance[x, y] <= 1)
+
+    def can_fish_at(self, xs, ys):
+        """can_fish 的数组版本，坐标必须在地图内"""
+        return self.water_distance[xs, ys] <= 1
+
+    def body_at(self, x, y):
+        """站在 (x, y) 钓鱼时钓的是哪个水体：脚下或周围 3x3 的水，没有就返回 0"""
+        if self.labels[x, y]:
+            return int(self.labels[x, y])
+        width, height = self.labels.shape
+        for dx, dy in OFFSETS_8:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and self.labels[nx, ny]:
+                return int(self.labels[nx, ny])
+        return 0
+
+    def direction_to_land(self, x, y):
+        """在水里往最近的岸游一格的方向 (dx, dy)；已经在岸上或 MAX_DISTANCE 内没有岸时返回 None"""
+        best = self.land_distance[x, y]
+        if best == 0 or best == FAR:
+            return None
+        width, height = self.land_distance.shape
+        for dx, dy in OFFSETS_8:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < width and 0 <= ny < height and self.land_distance[nx, ny] < best:
+                return dx, dy
+        return None
+
+
+class FishPopulation:
+    """一个水体里的鱼：每种鱼有容量和现存数量，钓走就少一条，每天往容量恢复一部分
+
+    每个季节建一张别名表（只含当季的鱼，权重 = 容量 / 难度），抽一次 O(1)。
+    数量减少用拒绝采样体现：抽中的鱼以 现存/容量 的概率接受，
+    实际分布就正比于 现存 / 难度，钓空的水体就不再有鱼上钩。
+    现存数量是小数（每天的恢复按比例累积），只在比较时取整数条。
+    capacity 为 None 表示鱼取之不尽（不知道在哪个水体时用，抽法与原来一样）。
+    """
+
+    def __init__(self, config, capacity=None):
+        self.fish_types = config.fish_types
+        self.names = list(config.fish_types)
+        self.capacity = capacity
+        self.stock = None if capacity is None else [float(count) for count in capacity]
+        self.regen_rate = config.fish_regen_rate
+        self.tables = {}  # 季节 -> (当季鱼的下标, 别名表)
+
+    def table(self, season):
+        """当季的别名表，第一次用到时建好；season 为 None 不按季节筛选"""
+        if season not in self.tables:
+            indices = [i for i, name in enumerate(self.names)
+                       if season is None or self.fish_types[name]["season"] in ("all", season)]
+            weights = [(1 if self.capacity is None else self.capacity[i]) / self.fish_types[self.names[i]]["difficulty"]
+                       for i in indices]
+            self.tables[season] = (indices, AliasTable(weights) if indices else None)
+        return self.tables[season]
+
+    def bite(self, season, rng=random):
+        """哪种鱼上钩（还没钓上来，不从水体里拿走）；当季没有鱼或者试了几次都被拒绝返回 None"""
+        indices, table = self.table(season)
+        if table is None:
+            return None
+        for _ in range(CATCH_TRIES):
+            index = indices[table.draw(rng)]
+            if self.stock is None:
+                return self.names[index]
+            if rng.random() * self.capacity[index] < int(self.stock[index]):
+                return self.names[index]
+        return None
+
+    def take(self, fish_type):
+        """钓上来一条，从水体里拿走"""
+        if self.stock is not None:
+            index = self.names.index(fish_type)
+            self.stock[index] = max(0.0, self.stock[index] - 1)
+
+    def catch(self, season, rng=random):
+        """上钩并钓上来，返回鱼的种类或 None"""
+        fish_type = self.bite(season, rng)
+        if fish_type is not None:
+            self.take(fish_type)
+        return fish_type
+
+    def regenerate(self, days=1):
+        """每天补回缺口的 regen_rate，days 天一次算完"""
+        if self.stock is None or days <= 0:
+            return
+        keep = (1 - self.regen_rate) ** days
+        for index, capacity in enumerate(self.capacity):
+            self.stock[index] = capacity - (capacity - self.stock[index]) * keep
+
+
+def stock_body(config, size, rng):
+    """给一个 size 格的水体放鱼：每种鱼的容量随水面大小增长，再乘上这个水体自己的随机丰度"""
+    capacity = [max(1, round(size * config.fish_per_tile * rng.uniform(0.2, 1.0)))
+                for _ in config.fish_types]
+    return FishPopulation(config, capacity)
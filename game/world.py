@@ -1,148 +1,210 @@
 import random
+import numpy as np
 import pygame
+from game.render import TerrainLayer, interpolate
+from game.grid import TileGrid
+from game.tiles import TileRegistry
+from game.chunks import ChunkedTileGrid
+from game.worldgen import generate_region, region_rng
+from game.pathfinding import FlowField, SectorGraph, RouteCache
+from game.water import WaterFields, FishPopulation, stock_body
 
-class Tile:
-    def __init__(self, type, x, y):
-        self.type = type
-        self.x = x
-        self.y = y
-        self.tilled = False
-        self.watered = False
-        self.crop = None
-        self.growth_stage = 0
-        self.growth_time = 0
-        self.has_forage = False
-        self.forage_type = None
+# 相邻格子的偏移：左、右、上、下
+NEIGHBOUR_OFFSETS = ((-1, 0), (1, 0), (0, -1), (0, 1))
 
-class Crop:
-    def __init__(self, type, growth_time):
-        self.type = type
-        self.growth_time = growth_time
-        self.growth_days = 0
-        self.watered_today = False
-        self.is_ready = False
-    
-    def grow(self):
-        if self.watered_today:
-            self.growth_days += 1
-            if self.growth_days >= self.growth_time:
-                self.is_ready = True
-        self.watered_today = False  # Reset for the new day
+# 计算字形编号需要的瓦片数组
+GLYPH_ARRAYS = ("type", "forage", "crop", "crop_growth", "crop_ready")
 
 class World:
     def __init__(self, config):
         self.config = config
         self.width = config.map_width
         self.height = config.map_height
-        self.tiles = [[None for _ in range(self.height)] for _ in range(self.width)]
+        self.seed = config.world_seed if config.world_seed is not None else random.randrange(2 ** 32)
+        self.registry = TileRegistry(config)
+        
+        # 稀疏索引：只记录种了作物和浇过水的瓦片，逐帧/逐日更新只遍历这些位置
+        self.planted_tiles = set()
+        self.watered_tiles = set()
         
         # Areas
         self.farm_area = (10, 10, 20, 15)  # x, y, width, height
         self.foraging_areas = []
         
+        # 离屏地形层，第一次绘制时创建
+        self.terrain_layer = None
+        self.view_x_start = 0  # 视口左上角所在的格子，draw 时更新
+        self.view_y_start = 0
+        self.view_x = 0.0  # 镜头左上角的精确位置（跟着插值后的玩家走，可以在两格之间）
+        self.view_y = 0.0
+        self.view_offset = (0, 0)  # 镜头相对 view_x_start 的像素偏移
+        self.changed_rects = []  # 上一次 draw 时地形变化过的屏幕区域
+        
         # Home position - define this BEFORE calling generate_world
         self.home_position = (12, 12)
         
         # Now generate the world
-        self.generate_world()
+        if config.chunked_world:
+            # 大地图：区块在第一次访问时才生成
+            self.grid = ChunkedTileGrid(self.registry, config, self.width, self.height, self.seed, self.home_position)
+        else:
+            self.grid = TileGrid(self.registry, self.width, self.height)
+            self.generate_world()
+        
+        # 到水面/到岸边的距离场，钓鱼和游泳判定查表即可；区块地图没有整张的类型数组，仍逐格检查
+        self.water = None if config.chunked_world else WaterFields(self)
+        
+        # 每个水体（河、各个湖）有自己的鱼群；不知道在哪个水体时钓的是取之不尽的“野水”
+        body_rng = random.Random(self.seed)
+        sizes = self.water.body_sizes if self.water is not None else []
+        self.fish_populations = [stock_body(config, size, body_rng) for size in sizes]
+        self.open_water = FishPopulation(config)
+        self.season = None  # update 时从时间系统同步，钓鱼按季节筛选
+        
+        # 以玩家为目标的距离场，所有跟随者共用
+        self.follow_field = FlowField(self, config.flow_field_radius)
+        # 长距离路线（回家、NPC日程）走分层寻路
+        self.routes = SectorGraph(self, config.sector_size)
+        if not config.chunked_world:
+            self.routes.precompute()  # 整张地图已经在内存里，扇区的边一次建好，第一次查询不用再等
+        self.route_cache = RouteCache(self, config.route_cache_size)
         
         # Create foraging areas
         for _ in range(20):
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            if self.tiles[x][y].type == "grass":
+            x, y = self.grid.random_position(random)
+            if self.get_tile(x, y).type == "grass":
                 forage_types = list(self.config.forage_types.keys())
                 chosen_type = random.choice(forage_types)
-                self.tiles[x][y].has_forage = True
-                self.tiles[x][y].forage_type = chosen_type
+                self.get_tile(x, y).forage_type = chosen_type
                 self.foraging_areas.append((x, y))
     
     def generate_world(self):
         # Generate a basic world with grass, water, and other features
-        for x in range(self.width):
-            for y in range(self.height):
-                # Generate mostly grass
-                tile_type = "grass"
-                
-                # Create a river
-                if 35 <= x <= 38:
-                    tile_type = "water"
-                
-                # Create multiple lakes
-                lakes = [
-                    (45, 15, 5),  # x, y, radius
-                    (15, 30, 4),
-                    (25, 8, 3),
-                    (8, 20, 3)
-                ]
-                
-                for lake_x, lake_y, radius in lakes:
-                    if (x - lake_x) ** 2 + (y - lake_y) ** 2 <= radius ** 2:
-                        tile_type = "water"
-                        break
-                
-                # Create some trees and rocks
-                if tile_type == "grass" and random.random() < 0.05:
-                    tile_type = "tree"
-                elif tile_type == "grass" and random.random() < 0.03:
-                    tile_type = "rock"
-                
-                # Create farmland
-                if 10 <= x < 30 and 10 <= y < 25:
-                    if random.random() < 0.7:
-                        tile_type = "untilled_soil"
-                
-                self.tiles[x][y] = Tile(tile_type, x, y)
-        
-        # Place house
-        house_x, house_y = self.home_position
-        for dx in range(-1, 2):
-            for dy in range(-1, 2):
-                x, y = house_x + dx, house_y + dy
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    self.tiles[x][y].type = "house"
+        generate_region(self.grid, region_rng(self.seed), self.home_position)
+    
+    def set_focus(self, x, y):
+        """告诉世界玩家在哪里，分区块的世界据此换出远处的区块"""
+        if self.config.chunked_world:
+            self.grid.set_focus(x, y)
     
     def get_tile(self, x, y):
         if 0 <= x < self.width and 0 <= y < self.height:
-            return self.tiles[x][y]
+            return self.grid.view(x, y)
         return None
     
     def is_walkable(self, x, y):
-        tile = self.get_tile(x, y)
-        if tile is None:
+        """O(1) 查询通行位图；房屋等非障碍物都可以通行，只有水、树、岩石挡路"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
             return False
-        
-        # Add more walkable tile types, including house and any other non-obstacle tiles
-        walkable_types = ["grass", "untilled_soil", "tilled_soil", "watered_soil", "house"]
-        
-        # Block only solid obstacles like water, trees, and rocks
-        non_walkable_types = ["water", "tree", "rock"]
-        
-        return tile.type not in non_walkable_types
+        grid, i, j = self.grid.locate(x, y)
+        return bool(grid.walkable[i, j])
+    
+    def is_soil(self, x, y):
+        """查表判断是不是泥土（未耕/已耕/浇过水），耕地、浇水、种植先用它排除别的地形"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return False
+        grid, i, j = self.grid.locate(x, y)
+        return bool(self.registry.soil[grid.type[i, j]])
+    
+    def walkable_at(self, xs, ys):
+        """is_walkable 的批量版本：xs、ys 是坐标数组，返回布尔数组"""
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        if self.config.chunked_world:
+            return np.array([self.is_walkable(x, y) for x, y in zip(xs.tolist(), ys.tolist())], dtype=bool)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        result = np.zeros(xs.shape, dtype=bool)
+        result[inside] = self.grid.walkable[xs[inside], ys[inside]]
+        return result
+    
+    def water_near_at(self, xs, ys):
+        """start_fishing 的批量版本：每个坐标周围 3x3 内有没有水"""
+        xs = np.asarray(xs)
+        ys = np.asarray(ys)
+        if self.water is None:
+            return np.array([self.start_fishing(x, y) for x, y in zip(xs.tolist(), ys.tolist())], dtype=bool)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        result = np.zeros(xs.shape, dtype=bool)
+        result[inside] = self.water.can_fish_at(xs[inside], ys[inside])
+        return result
+    
+    def follow_step(self, x, y, target_x, target_y):
+        """从 (x, y) 朝目标走的下一格（沿最短路绕开障碍），不在距离场里时返回None"""
+        self.follow_field.set_target(target_x, target_y)
+        return self.follow_field.step(x, y)
+    
+    def find_path(self, start, goal):
+        """从 start 到 goal 的逐格路线（含两端），走不到返回None"""
+        return self.routes.find_path(start, goal)
+    
+    def route_to(self, start, goal):
+        """同 find_path，但常走的路线会缓存起来（点击移动用）"""
+        return self.route_cache.route(start, goal)
+    
+    def blocking_reason(self, x, y):
+        """返回挡路的原因（瓦片类型或"边界"），可以通行时返回None"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return "边界"
+        grid, i, j = self.grid.locate(x, y)
+        if grid.walkable[i, j]:
+            return None
+        return self.registry.names[grid.type[i, j]]
+    
+    def walkable_neighbours(self, x, y):
+        """返回 (x, y) 上下左右四个方向中可以通行的格子"""
+        return [(x + dx, y + dy) for dx, dy in NEIGHBOUR_OFFSETS if self.is_walkable(x + dx, y + dy)]
+    
+    def walkable_window(self, x, y, width, height):
+        """取出矩形区域的通行位图（会裁剪到地图范围内），返回 (x, y, 位图)"""
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + width), min(self.height, y + height)
+        return x0, y0, self.grid.window("walkable", x0, y0, x1 - x0, y1 - y0)
+    
+    def add_walkability_listener(self, listener):
+        """注册回调 listener(x, y)，某格通行性改变时调用"""
+        self.grid.walkability_listeners.append(listener)
+    
+    def add_tile_listener(self, listener):
+        """注册回调 listener(x, y)，某格瓦片类型改变时调用"""
+        self.grid.type_listeners.append(listener)
+    
+    def direction_to_land(self, x, y):
+        """在水里往最近的岸游一格的方向 (dx, dy)，没有距离场或附近没有岸时返回 None"""
+        if self.water is None or not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        return self.water.direction_to_land(x, y)
     
     def till_soil(self, x, y):
+        if not self.is_soil(x, y):
+            return False
         tile = self.get_tile(x, y)
-        if tile and tile.type == "untilled_soil":
+        if tile.type == "untilled_soil":
             tile.type = "tilled_soil"
             tile.tilled = True
             return True
         return False
     
     def water_soil(self, x, y):
+        if not self.is_soil(x, y):
+            return False
         tile = self.get_tile(x, y)
-        if tile and tile.type == "tilled_soil":
+        if tile.type == "tilled_soil":
             tile.type = "watered_soil"
             tile.watered = True
             if tile.crop:
                 tile.crop.watered_today = True
+            self.watered_tiles.add((x, y))
             return True
         return False
     
     def plant_crop(self, x, y, crop_type):
+        if not self.is_soil(x, y):
+            return False
         tile = self.get_tile(x, y)
-        if tile and (tile.type == "tilled_soil" or tile.type == "watered_soil") and not tile.crop:
-            growth_time = self.config.crop_types[crop_type]["growth_time"]
-            tile.crop = Crop(crop_type, growth_time)
+        if tile.type != "untilled_soil" and not tile.crop:
+            self.grid.plant_crop(x, y, crop_type)
+            tile.crop.watered_today = tile.watered
+            self.planted_tiles.add((x, y))
             return True
         return False
     
@@ -155,6 +217,8 @@ class World:
             tile.type = "tilled_soil"  # Reset to tilled state
             tile.tilled = True
             tile.watered = False
+            self.planted_tiles.discard((x, y))
+            self.watered_tiles.discard((x, y))
             return crop_type, value
         return None, 0
     
@@ -163,7 +227,6 @@ class World:
         if tile and tile.has_forage:
             forage_type = tile.forage_type
             value = self.config.forage_types[forage_type]["value"]
-            tile.has_forage = False
             tile.forage_type = None
             if (x, y) in self.foraging_areas:
                 self.foraging_areas.remove((x, y))
@@ -174,6 +237,8 @@ class World:
         """检查是否可以在指定位置钓鱼
         现在任何水域都可以钓鱼，不再需要特定的钓鱼点
         """
+        if self.water is not None and 0 <= x < self.width and 0 <= y < self.height:
+            return self.water.can_fish(x, y)
         # 检查玩家周围是否有水
         for dx in [-1, 0, 1]:
             for dy in [-1, 0, 1]:
@@ -184,173 +249,133 @@ class World:
                     return True
         return False
     
-    def catch_fish(self, difficulty=1.0):
+    def fish_population_at(self, x, y):
+        """在 (x, y) 钓鱼时面对的鱼群"""
+        if self.water is None or x is None or not (0 <= x < self.width and 0 <= y < self.height):
+            return self.open_water
+        label = self.water.body_at(x, y)
+        return self.fish_populations[label - 1] if label else self.open_water
+    
+    def hook_fish(self, x, y):
+        """在 (x, y) 下竿后哪种鱼会上钩；这里当季没有鱼（或被钓光了）返回 None"""
+        return self.fish_population_at(x, y).bite(self.season)
+    
+    def catch_fish(self, difficulty=1.0, x=None, y=None, fish_type=None):
         # Simple fishing minigame simulation
         # Difficulty is from 0.0 to 1.0
         # Returns fish_type, value
+        # (x, y) 是下竿的位置，决定钓的是哪个水体的鱼；fish_type 是已经上钩的鱼（见 hook_fish）
         
         if random.random() > difficulty:
-            fish_types = list(self.config.fish_types.keys())
-            weights = [1.0 / self.config.fish_types[ft]["difficulty"] for ft in fish_types]
-            total_weight = sum(weights)
-            normalized_weights = [w / total_weight for w in weights]
-            
-            fish_type = random.choices(fish_types, normalized_weights)[0]
-            value = self.config.fish_types[fish_type]["value"]
-            return fish_type, value
+            population = self.fish_population_at(x, y)
+            if fish_type is None:
+                fish_type = population.catch(self.season)
+            else:
+                population.take(fish_type)
+            if fish_type:
+                return fish_type, self.config.fish_types[fish_type]["value"]
         
         return None, 0
     
     def update(self, time_system):
-        # Grow crops
-        for x in range(self.width):
-            for y in range(self.height):
-                tile = self.tiles[x][y]
-                if tile.crop:
-                    tile.crop.watered_today = tile.watered
+        # 作物的浇水状态在 plant_crop / water_soil / update_day 里随写随改，逐帧不用再同步
+        if time_system is not None:  # 没有时间系统（如基准脚本）时沿用原来的季节
+            self.season = time_system.season
     
     def update_day(self):
         # Called when a new day starts
-        # Grow crops
-        for x in range(self.width):
-            for y in range(self.height):
-                tile = self.tiles[x][y]
-                if tile.crop and tile.watered:
-                    tile.crop.grow()
-                
-                # Reset watered state
-                if tile.watered:
-                    tile.watered = False
-                    if tile.type == "watered_soil":
-                        tile.type = "tilled_soil"
+        # Only watered tiles can change: grow their crops and reset the soil
+        for x, y in self.watered_tiles:
+            tile = self.grid.view(x, y)
+            if tile.crop:
+                tile.crop.grow()
+            
+            tile.watered = False
+            if tile.type == "watered_soil":
+                tile.type = "tilled_soil"
+        self.watered_tiles.clear()
         
         # Randomly add new forage items
         while len(self.foraging_areas) < 20:
-            x = random.randint(0, self.width - 1)
-            y = random.randint(0, self.height - 1)
-            if self.tiles[x][y].type == "grass" and not self.tiles[x][y].has_forage:
+            x, y = self.grid.random_position(random)
+            tile = self.get_tile(x, y)
+            if tile.type == "grass" and not tile.has_forage:
                 forage_types = list(self.config.forage_types.keys())
                 chosen_type = random.choice(forage_types)
-                self.tiles[x][y].has_forage = True
-                self.tiles[x][y].forage_type = chosen_type
+                tile.forage_type = chosen_type
                 self.foraging_areas.append((x, y))
+        
+        # 被钓走的鱼慢慢补回来
+        for population in self.fish_populations:
+            population.regenerate()
     
-    def draw(self, screen, player):
-        # Calculate view boundaries
-        view_x_start = max(0, player.x - self.config.view_width // 2)
-        view_y_start = max(0, player.y - self.config.view_height // 2)
-        view_x_end = min(self.width, view_x_start + self.config.view_width)
-        view_y_end = min(self.height, view_y_start + self.config.view_height)
+    def simulate_days(self, days, water_crops=False):
+        """一次推进 days 天，结果与逐天调用 update_day 相同，但不跑逐帧循环
         
-        tile_size = self.config.tile_size
+        water_crops=True 表示每天都给所有作物浇水。第一晚照常结算（今天浇过的水、采集物刷新），
+        之后没有人动地图：采集物已经补满不会再变，作物生长天数直接一次加上去。
+        """
+        if days <= 0:
+            return
+        if water_crops:
+            for x, y in self.planted_tiles:
+                self.water_soil(x, y)
+        self.update_day()
+        if water_crops and days > 1:
+            self.grow_crops(days - 1)
+        for population in self.fish_populations:
+            population.regenerate(days - 1)
+    
+    def grow_crops(self, days):
+        """所有作物都连续浇水生长 days 天，按区块批量计算"""
+        positions = {}
+        for x, y in self.planted_tiles:
+            grid, i, j = self.grid.locate(x, y)
+            columns, rows = positions.setdefault(grid, ([], []))
+            columns.append(i)
+            rows.append(j)
         
-        # 在类外部只导入一次get_font，不要在每次draw时导入
-        font = self.config.ascii_font
-        if font is None:
-            from game.util import get_font
-            font = get_font(is_ascii=True, size=tile_size)
-            self.config.ascii_font = font  # 存储在config中重复使用
+        for grid, index in positions.items():
+            grid.crop_growth[index] += days
+            grid.crop_ready[index] |= grid.crop_growth[index] >= self.registry.crop_growth_time[grid.crop[index]]
+            grid.dirty = True
+    
+    def draw(self, screen, player, alpha=1.0):
+        # 镜头、留空的格子和玩家字形都用同一个插值后的玩家位置
+        player_x = interpolate(player.prev_x, player.x, alpha)
+        player_y = interpolate(player.prev_y, player.y, alpha)
+        self.view_x = max(0, player_x - self.config.view_width // 2)
+        self.view_y = max(0, player_y - self.config.view_height // 2)
         
         # Store these values as attributes so player and cat classes can use them
-        self.view_x_start = view_x_start
-        self.view_y_start = view_y_start
+        self.view_x_start = int(self.view_x)
+        self.view_y_start = int(self.view_y)
+        
+        # 地形画在离屏层上，只补画变化过的瓦片；视口尺寸变了就重建
+        if self.terrain_layer is None or not self.terrain_layer.matches(self.config):
+            self.terrain_layer = TerrainLayer(self.config)
+        layer_rects = self.terrain_layer.update(self, self.view_x_start, self.view_y_start, GLYPH_ARRAYS)
         
-        # Draw visible tiles
-        for x in range(view_x_start, view_x_end):
-            for y in range(view_y_start, view_y_end):
-                # 跳过玩家所在位置
-                if x == player.x and y == player.y:
-                    continue
-                    
-                tile = self.tiles[x][y]
-                # Calculate screen position
-                screen_x = (x - view_x_start) * tile_size
-                screen_y = (y - view_y_start) * tile_size
-                
-                # Get the appropriate ASCII character for this tile
-                tile_symbol = self.get_tile_symbol(tile)
-                
-                # Get the appropriate color for this tile
-                tile_color = self.get_tile_color(tile)
-                
-                # Draw the tile using ASCII art
-                text_surface = font.render(tile_symbol, True, tile_color)
-                screen.blit(text_surface, (screen_x, screen_y))
+        # 镜头在两格之间时层按像素偏移贴上去；偏移变了整个视口都要重画
+        tile_size = self.config.tile_size
+        offset = (round((self.view_x - self.view_x_start) * tile_size),
+                  round((self.view_y - self.view_y_start) * tile_size))
+        view_rect = pygame.Rect(0, 0, self.config.view_width * tile_size, self.config.view_height * tile_size)
+        screen.blit(self.terrain_layer.surface, view_rect.topleft, view_rect.move(offset))
+        if offset != self.view_offset:
+            self.changed_rects = [view_rect]
+        else:
+            self.changed_rects = [rect.move(-offset[0], -offset[1]).clip(view_rect) for rect in layer_rects]
+        self.view_offset = offset
+        
+        # 玩家所在的格子留空，由玩家自己绘制；返回留空的区域
+        return screen.fill((0, 0, 0), (round((player_x - self.view_x) * tile_size),
+                                       round((player_y - self.view_y) * tile_size), tile_size, tile_size))
     
     def get_tile_symbol(self, tile):
         """获取瓦片的ASCII符号"""
-        char = self.config.ascii_tiles["grass"]  # Default
-        
-        if tile.type == "water":
-            char = self.config.ascii_tiles["water"]
-        elif tile.type == "untilled_soil":
-            char = self.config.ascii_tiles["untilled_soil"]
-        elif tile.type == "tilled_soil":
-            char = self.config.ascii_tiles["tilled_soil"]
-        elif tile.type == "watered_soil":
-            char = self.config.ascii_tiles["watered_soil"]
-        elif tile.type == "tree":
-            char = self.config.ascii_tiles["tree"]
-        elif tile.type == "rock":
-            char = self.config.ascii_tiles["rock"]
-        elif tile.type == "house":
-            char = self.config.ascii_tiles["house"]
-        
-        # Forage items
-        if tile.has_forage:
-            char = self.config.ascii_tiles["forage"]
-        
-        # Crops
-        if tile.crop:
-            if tile.crop.is_ready:
-                char = self.config.ascii_tiles["crop_ready"]
-            else:
-                # Calculate growth stage (0-3)
-                growth_pct = tile.crop.growth_days / tile.crop.growth_time
-                if growth_pct < 0.33:
-                    char = self.config.ascii_tiles["crop_stage_1"]
-                elif growth_pct < 0.66:
-                    char = self.config.ascii_tiles["crop_stage_2"]
-                else:
-                    char = self.config.ascii_tiles["crop_stage_3"]
-        
-        return char
+        return self.registry.glyphs[self.registry.glyph_id(tile.grid, tile.i, tile.j)][0]
     
     def get_tile_color(self, tile):
         """获取瓦片的颜色"""
-        color = self.config.colors["grass"]  # Default
-        
-        if tile.type == "water":
-            color = self.config.colors["water"]
-        elif tile.type in ["untilled_soil", "tilled_soil", "watered_soil"]:
-            color = self.config.colors["soil"]
-        elif tile.type == "tree":
-            color = self.config.colors["tree"]
-        elif tile.type == "rock":
-            color = self.config.colors["rock"]
-        elif tile.type == "house":
-            color = self.config.colors["house"]
-        
-        # Forage items
-        if tile.has_forage:
-            color = self.config.colors["forage"]
-        
-        # Crops
-        if tile.crop:
-            color = self.config.colors["crop"]
-        
-        return color
-    
-    def has_adjacent_land(self, x, y):
-        """检查水域周围是否有可站立的陆地"""
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                if dx == 0 and dy == 0:
-                    continue
-                    
-                new_x, new_y = x + dx, y + dy
-                if 0 <= new_x < self.width and 0 <= new_y < self.height:
-                    tile = self.tiles[new_x][new_y]
-                    if tile.type in ["grass", "untilled_soil", "tilled_soil", "watered_soil"]:
-                        return True
-        return False 
\ No newline at end of file
+        return self.registry.glyphs[self.registry.glyph_id(tile.grid, tile.i, tile.j)][1]
@@ -0,0 +1,78 @@
+import numpy as np
+
+# 固定地形（世界坐标）
+RIVER_X_RANGE = (35, 38)  # 河流所在的列（包含两端）
+LAKES = [
+    (45, 15, 5),  # x, y, radius
+    (15, 30, 4),
+    (25, 8, 3),
+    (8, 20, 3)
+]
+FARMLAND_AREA = (10, 10, 30, 25)  # x_start, y_start, x_end, y_end（不含end）
+
+# 随机地物的概率
+TREE_CHANCE = 0.05
+ROCK_CHANCE = 0.03
+FARMLAND_CHANCE = 0.7
+
+
+def region_rng(seed, cx=0, cy=0):
+    """区块的随机数生成器，只取决于世界种子和区块坐标"""
+    return np.random.default_rng([seed, cx, cy])
+
+
+def _clip(start, end, origin, size):
+    """把世界坐标区间 [start, end) 裁剪成区域内的下标区间"""
+    return max(start - origin, 0), min(end - origin, size)
+
+
+def generate_region(grid, rng, home_position):
+    """生成 grid 覆盖的区域，整个区域一次性用数组运算完成
+
+    grid 可以是整张地图，也可以是一个区块；地形只取决于世界坐标和 rng，
+    所以同一个区块用同样的种子总会生成同样的结果。
+    """
+    codes = grid.registry.codes
+    width, height = grid.width, grid.height
+    origin_x, origin_y = grid.origin_x, grid.origin_y
+    water = np.zeros((width, height), dtype=bool)
+
+    # Create a river
+    i0, i1 = _clip(RIVER_X_RANGE[0], RIVER_X_RANGE[1] + 1, origin_x, width)
+    water[i0:i1, :] = True
+
+    # Create multiple lakes (only the lake's bounding box is evaluated)
+    for lake_x, lake_y, radius in LAKES:
+        i0, i1 = _clip(lake_x - radius, lake_x + radius + 1, origin_x, width)
+        j0, j1 = _clip(lake_y - radius, lake_y + radius + 1, origin_y, height)
+        if i0 >= i1 or j0 >= j1:
+            continue
+        dx = np.arange(i0, i1)[:, None] + origin_x - lake_x
+        dy = np.arange(j0, j1)[None, :] + origin_y - lake_y
+        water[i0:i1, j0:j1] |= dx * dx + dy * dy <= radius * radius
+
+    # Create some trees and rocks
+    tree = ~water & (rng.random((width, height), dtype=np.float32) < TREE_CHANCE)
+    rock = ~water & ~tree & (rng.random((width, height), dtype=np.float32) < ROCK_CHANCE)
+
+    tiles = np.full((width, height), codes["grass"], dtype=np.uint8)
+    tiles[water] = codes["water"]
+    tiles[tree] = codes["tree"]
+    tiles[rock] = codes["rock"]
+
+    # Create farmland
+    x_start, y_start, x_end, y_end = FARMLAND_AREA
+    i0, i1 = _clip(x_start, x_end, origin_x, width)
+    j0, j1 = _clip(y_start, y_end, origin_y, height)
+    if i0 < i1 and j0 < j1:
+        farmland = rng.random((i1 - i0, j1 - j0), dtype=np.float32) < FARMLAND_CHANCE
+        tiles[i0:i1, j0:j1][farmland] = codes["untilled_soil"]
+
+    # Place house
+    house_x, house_y = home_position
+    i0, i1 = _clip(house_x - 1, house_x + 2, origin_x, width)
+    j0, j1 = _clip(house_y - 1, house_y + 2, origin_y, height)
+    tiles[i0:i1, j0:j1] = codes["house"]
+
+    grid.type[...] = tiles
+    grid.refresh_walkable()
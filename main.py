@@ -1,14 +1,19 @@
 import pygame
 import sys
+import argparse
 from game.world import World
 from game.player import Player
 from game.cat import Cat
-from game.ui import UI
+from game.population import CatPopulation
 from game.time_system import TimeSystem
 from game.config import Config
+from game.render import DirtyRegions
+from game.spatial import SpatialHash
+from game.headless import run_headless
+from game.clock import ScaledClock
+from game.scheduler import Scheduler
 # 注释掉原来的导入，直接在这里实现字体加载
 # from game.util import get_font
-import pygame_gui
 
 class Game:
     def __init__(self):
@@ -22,14 +27,35 @@ class Game:
         self.initialize_fonts()
         
         self.clock = pygame.time.Clock()
-        self.fps = 60
+        self.fps = self.config.max_fps
+        
+        # 固定步长模拟：渲染多快都行，模拟总是按 sim_step 一步步推进
+        self.sim_step = 1.0 / self.config.sim_rate
+        self.accumulator = 0.0
+        
+        # 游戏时钟：所有子系统都从这里读时间，可以暂停和快进
+        self.game_clock = ScaledClock(scale=self.config.clock_scale)
+        self.scheduler = Scheduler(self.game_clock)  # 定时事件（钓鱼、猫咪情绪、通知过期）
         
         # Initialize game systems
-        self.time_system = TimeSystem()
+        self.time_system = TimeSystem(self.game_clock)
         self.world = World(self.config)
-        self.player = Player(self.config, self.world)
-        self.cat = Cat(self.config, self.player)
-        self.ui = UI(self.screen, self.config, self.player, self.cat, self.time_system)
+        self.player = Player(self.config, self.world, self.game_clock, self.scheduler)
+        self.cat = Cat(self.config, self.player, self.game_clock, self.scheduler)
+        self.active_cat = self.cat  # 正在交互（或被举着）的猫，界面上显示的也是它
+        
+        # 实体空间哈希：“附近有哪只猫”之类的查询只看周围几个桶
+        self.entities = SpatialHash(self.config.spatial_cell_size)
+        self.entities.insert(self.cat, self.cat.x, self.cat.y)
+        self.cafe_cats = None
+        if self.config.cafe_cats:
+            self.cafe_cats = CatPopulation(self.config, self.player, self.config.cafe_cats,
+                                           self.game_clock, self.scheduler, entities=self.entities)
+        self.dirty_regions = DirtyRegions(self.config.dirty_rects)
+        # UI 依赖 pygame_gui，只在开窗口时导入，--headless 不需要装它
+        from game.ui import UI
+        self.ui = UI(self.screen, self.config, self.player, self.cat, self.time_system, self.dirty_regions,
+                     self.scheduler)
         
         # Game state
         self.running = True
@@ -118,24 +144,24 @@ class Game:
                     return
                 
                 # 如果猫被举起，处理猫的投掷
-                if self.cat.is_picked_up:
+                if self.active_cat.is_picked_up:
                     if event.key == pygame.K_w or event.key == pygame.K_UP:
-                        self.cat.throw(0)  # 向上丢
+                        self.active_cat.throw(0)  # 向上丢
                         self.add_debug_message(f"互动: 将猫丢向上方")
                     elif event.key == pygame.K_d or event.key == pygame.K_RIGHT:
-                        self.cat.throw(1)  # 向右丢
+                        self.active_cat.throw(1)  # 向右丢
                         self.add_debug_message(f"互动: 将猫丢向右方")
                     elif event.key == pygame.K_s or event.key == pygame.K_DOWN:
-                        self.cat.throw(2)  # 向下丢
+                        self.active_cat.throw(2)  # 向下丢
                         self.add_debug_message(f"互动: 将猫丢向下方")
                     elif event.key == pygame.K_a or event.key == pygame.K_LEFT:
-                        self.cat.throw(3)  # 向左丢
+                        self.active_cat.throw(3)  # 向左丢
                         self.add_debug_message(f"互动: 将猫丢向左方")
                     elif event.key == pygame.K_e:
                         # 放下猫
-                        self.cat.is_picked_up = False
-                        self.cat.x = self.player.x
-                        self.cat.y = self.player.y
+                        self.active_cat.is_picked_up = False
+                        self.active_cat.x = self.player.x
+                        self.active_cat.y = self.player.y
                         self.add_debug_message(f"互动: 放下了猫")
                     return
                 
@@ -163,7 +189,7 @@ class Game:
                             self.add_debug_message(f"钓鱼: 开始钓鱼...")
                         else:
                             # 如果不能钓鱼，尝试其他交互
-                            interact_result = self.player.interact(self.world, self.cat)
+                            interact_result = self.player.interact(self.world, self.active_cat)
                             
                             # 处理交互结果
                             if isinstance(interact_result, tuple):
@@ -210,15 +236,19 @@ class Game:
                 
                 # Movement
                 elif event.key == pygame.K_w:
+                    self.player.stop_route()
                     self.player.move(0, -1, self.world)
                     self.add_debug_message(f"玩家位置: ({self.player.x}, {self.player.y})")
                 elif event.key == pygame.K_s:
+                    self.player.stop_route()
                     self.player.move(0, 1, self.world)
                     self.add_debug_message(f"玩家位置: ({self.player.x}, {self.player.y})")
                 elif event.key == pygame.K_a:
+                    self.player.stop_route()
                     self.player.move(-1, 0, self.world)
                     self.add_debug_message(f"玩家位置: ({self.player.x}, {self.player.y})")
                 elif event.key == pygame.K_d:
+                    self.player.stop_route()
                     self.player.move(1, 0, self.world)
                     self.add_debug_message(f"玩家位置: ({self.player.x}, {self.player.y})")
                 elif event.key == pygame.K_RETURN:
@@ -228,11 +258,35 @@ class Game:
                         self.world.update_day()
                         self.add_debug_message(f"睡眠: 进入下一天")
     
+    def step_frame(self, frame_time):
+        """推进一帧：按累积的游戏时间跑若干个固定模拟步，再插值绘制
+
+        frame_time 是真实经过的秒数，乘上游戏时钟的倍率（暂停时为0）才是要模拟的时间。
+        """
+        self.accumulator += min(frame_time * self.game_clock.rate, self.config.max_frame_time)
+        while self.accumulator >= self.sim_step - 1e-9:  # 容忍浮点累加误差
+            for entity in (self.player, self.cat):
+                entity.prev_x, entity.prev_y = entity.x, entity.y
+            if self.cafe_cats:
+                self.cafe_cats.remember_positions()
+            self.update()
+            self.accumulator -= self.sim_step
+        
+        self.ui.ui_manager.update(frame_time)
+        self.ui.update_status_bar()
+        self.ui.update_debug_panel(self.debug_messages)
+        self.draw(max(0.0, self.accumulator / self.sim_step))
+    
     def update(self):
-        # Update time
-        self.time_system.update()
+        # Update time, then fire the timers that came due
+        self.time_system.update(self.sim_step)
+        self.scheduler.run_due()
+        
+        # 点击移动
+        self.player.follow_route()
         
         # Update world (crops grow, etc.)
+        self.world.set_focus(self.player.x, self.player.y)
         self.world.update(self.time_system)
         
         # Update cat behavior
@@ -242,9 +296,13 @@ class Game:
         if self.cat.is_picked_up:
             self.cat.x = self.player.x
             self.cat.y = self.player.y
+        self.entities.move(self.cat, self.cat.x, self.cat.y)
+        
+        if self.cafe_cats:
+            self.cafe_cats.update(self.world, self.player)
         
-        # Update fishing status
-        if self.player.fishing_active:
+        # Update fishing status (events from fishing timers arrive here too)
+        if self.player.fishing_active or self.player.fishing_events:
             result = self.player.update_fishing()
             if result == "fish_bite":
                 self.add_debug_message("钓鱼: 鱼上钩了！快按E收杆！")
@@ -252,6 +310,8 @@ class Game:
                 self.add_debug_message("钓鱼: 鱼跑掉了...")
             elif result == "line_break":
                 self.add_debug_message("钓鱼: 线断了! 张力太高了")
+            elif result == "no_bite":
+                self.add_debug_message("钓鱼: 等了半天没有鱼咬钩，这里好像被钓空了...")
         
         # Natural energy drain over time
         self.player.energy_tick()
@@ -267,21 +327,32 @@ class Game:
                 self.player.energy = 20
                 self.player.position = self.player.home_position
     
-    def draw(self):
-        # Clear screen
-        self.screen.fill((0, 0, 0))
+    def draw(self, alpha=1.0):
+        # 地形层会整块覆盖视口，只需清空视口以外的区域
+        view_rect = pygame.Rect(0, 0, self.config.view_width * self.config.tile_size,
+                                self.config.view_height * self.config.tile_size)
+        self.screen.fill((0, 0, 0), (view_rect.right, 0, self.width - view_rect.right, self.height))
+        self.screen.fill((0, 0, 0), (0, view_rect.bottom, view_rect.right, self.height - view_rect.bottom))
         
         # Draw world
-        self.world.draw(self.screen, self.player)
+        player_cell = self.world.draw(self.screen, self.player, alpha)
+        self.dirty_regions.rects.extend(self.world.changed_rects)
+        self.dirty_regions.track("player_cell", player_cell)
         
         # Draw player and cat
-        self.player.draw(self.screen)
-        self.cat.draw(self.screen)
+        self.dirty_regions.track("player", self.player.draw(self.screen, alpha))
+        self.dirty_regions.track("cat", self.cat.draw(self.screen, alpha))
+        if self.cafe_cats:
+            for index, rect in self.cafe_cats.draw(self.screen, alpha):
+                self.dirty_regions.track(("cafe_cat", index), rect)
         
         # Draw UI elements
         self.ui.draw(self.current_tool)
+        self.ui.ui_manager.draw_ui(self.screen)
+        self.dirty_regions.track_gui(self.ui.ui_manager)
         
-        pygame.display.flip()
+        # 脏矩形模式只推送变化过的区域，否则整屏 flip
+        self.dirty_regions.present(self.screen, self.config.show_dirty_rects)
     
     def run(self):
         # Add initial debug message
@@ -290,28 +361,53 @@ class Game:
             for event in pygame.event.get():
                 self.handle_events_single(event)
                 self.ui.ui_manager.process_events(event)
-            self.update()
-            time_delta = self.clock.tick(self.fps) / 1000.0
-            self.ui.ui_manager.update(time_delta)
-            self.ui.update_status_bar()
-            self.ui.update_debug_panel(self.debug_messages)
-            self.draw()
-            self.ui.ui_manager.draw_ui(self.screen)
+            self.step_frame(self.clock.tick(self.fps) / 1000.0)
         pygame.quit()
         sys.exit()
 
+    def cat_entity(self, item):
+        """空间哈希里的实体 -> 猫对象（猫咖的猫存的是编号）"""
+        if isinstance(item, tuple) and item[0] == "cafe_cat":
+            return self.cafe_cats.view(item[1])
+        return item
+    
+    def find_cat(self, radius, available):
+        """玩家周围 radius 格内满足 available(cat) 的最近的猫，没有返回None"""
+        for item in self.entities.query_radius(self.player.x, self.player.y, radius):
+            cat = self.cat_entity(item)
+            if isinstance(cat, Cat) and available(cat):
+                return cat
+        return None
+    
+    def select_cat(self, cat):
+        self.active_cat = cat
+        self.ui.cat = cat
+    
+    def handle_map_click(self, mx, my):
+        """把屏幕坐标换算成瓦片坐标，让玩家沿路线走过去"""
+        tile_size = self.config.tile_size
+        if mx >= self.config.view_width * tile_size or my >= self.config.view_height * tile_size:
+            return
+        if self.ui.show_interaction_menu or self.ui.ui_manager.get_hovering_any_element():
+            return
+        x = int(self.world.view_x + mx / tile_size)
+        y = int(self.world.view_y + my / tile_size)
+        if self.player.walk_to(x, y):
+            self.add_debug_message(f"移动: 前往 ({x}, {y})，共{len(self.player.route)}步")
+        else:
+            self.add_debug_message(f"移动: 无法到达 ({x}, {y})")
+    
     def is_near_cat(self):
-        """检查玩家是否在猫附近"""
-        return (abs(self.player.x - self.cat.x) <= 1 and 
-                abs(self.player.y - self.cat.y) <= 1 and
-                not self.cat.is_picked_up and
-                not self.cat.is_thrown and
-                not self.cat.is_swimming)
+        """检查玩家是否在猫附近（找到的猫成为交互对象）"""
+        cat = self.find_cat(1, lambda cat: not (cat.is_picked_up or cat.is_thrown or cat.is_swimming))
+        if cat:
+            self.select_cat(cat)
+        return cat is not None
                 
     def handle_cat_interaction(self, option):
         """处理猫咪交互菜单的选择"""
         if option == "抚摸":
-            self.cat.pet()
+            self.active_cat.pet()
             self.add_debug_message("互动: 抚摸了猫咪，好感度提升")
         elif option == "喂食":
             # 检查玩家是否有鱼
@@ -325,12 +421,12 @@ class Game:
                     
             if has_fish:
                 self.player.inventory[fish_type] -= 1
-                self.cat.feed()
+                self.active_cat.feed()
                 self.add_debug_message(f"互动: 喂食了{fish_type}，猫咪饱食度提升")
             else:
                 self.add_debug_message("互动: 没有鱼可以喂食")
         elif option == "举起":
-            if self.cat.pick_up():
+            if self.active_cat.pick_up():
                 self.add_debug_message("互动: 将猫咪举起，按方向键丢出或按E放下")
         
         # 隐藏菜单
@@ -350,19 +446,43 @@ class Game:
             return
             
         # 将输入转给猫处理
-        response = self.cat.respond_to_dialog(text)
+        response = self.active_cat.respond_to_dialog(text)
         self.add_debug_message(f"猫咪: {response}")
         
     def is_cat_nearby_for_chat(self):
-        """检查猫是否在附近可以对话（更宽松的范围）"""
-        return (abs(self.player.x - self.cat.x) <= 5 and 
-                abs(self.player.y - self.cat.y) <= 5 and
-                not self.cat.is_thrown)
+        """检查猫是否在附近可以对话（更宽松的范围，找到的猫成为交互对象）"""
+        if self.active_cat.is_picked_up:
+            return True  # 举着的猫就在身边
+        cat = self.find_cat(5, lambda cat: not cat.is_thrown)
+        if cat:
+            self.select_cat(cat)
+        return cat is not None
 
     # 新增单事件处理方法，原handle_events内容迁移到此
     def handle_events_single(self, event):
         if event.type == pygame.QUIT:
             self.running = False
+        # 窗口被遮挡后重新露出，整屏重画
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.dirty_regions.invalidate()
+        # F3 切换脏矩形诊断叠加层
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.config.show_dirty_rects = not self.config.show_dirty_rects
+            return
+        # P 暂停/继续，F 快进/恢复正常速度
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_p and not self.ui.show_text_input:
+            self.game_clock.toggle_pause()
+            self.add_debug_message("时间: 暂停" if self.game_clock.paused else "时间: 继续")
+            return
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_f and not self.ui.show_text_input:
+            fast = self.game_clock.scale != self.config.fast_forward_scale
+            self.game_clock.set_scale(self.config.fast_forward_scale if fast else self.config.clock_scale)
+            self.add_debug_message(f"时间: {self.game_clock.scale:g}倍速")
+            return
+        # 暂停时不响应其他游戏按键，Esc 除外（关菜单/退出）
+        if self.game_clock.paused and event.type == pygame.KEYDOWN and event.key != pygame.K_ESCAPE:
+            return
+        import pygame_gui
         # 处理pygame_gui按钮点击事件（猫咪互动菜单）
         if event.type == pygame_gui.UI_BUTTON_PRESSED:
             if hasattr(event.ui_element, 'object_id') and event.ui_element.object_id.startswith('#cat_menu_'):
@@ -389,6 +509,10 @@ class Game:
         # 如果文本输入框激活，优先处理文本输入（已迁移为pygame_gui，不再需要原逻辑）
         if self.ui.show_text_input:
             return
+        # 左键点击地图：自动走过去
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            self.handle_map_click(*event.pos)
+            return
         # Handle key presses
         if event.type == pygame.KEYDOWN:
             key_name = pygame.key.name(event.key)
@@ -405,24 +529,24 @@ class Game:
                     self.ui.hide_interaction_menu()
                 return
             # 如果猫被举起，处理猫的投掷
-            if self.cat.is_picked_up:
+            if self.active_cat.is_picked_up:
                 if event.key == pygame.K_w or event.key == pygame.K_UP:
-                    self.cat.throw(0)  # 向上丢
+                    self.active_cat.throw(0)  # 向上丢
                     self.add_debug_message(f"互动: 将猫丢向上方")
                 elif event.key == pygame.K_d or event.key == pygame.K_RIGHT:
-                    self.cat.throw(1)  # 向右丢
+                    self.active_cat.throw(1)  # 向右丢
                     self.add_debug_message(f"互动: 将猫丢向右方")
                 elif event.key == pygame.K_s or event.key == pygame.K_DOWN:
-                    self.cat.throw(2)  # 向下丢
+                    self.active_cat.throw(2)  # 向下丢
                     self.add_debug_message(f"互动: 将猫丢向下方")
                 elif event.key == pygame.K_a or event.key == pygame.K_LEFT:
-                    self.cat.throw(3)  # 向左丢
+                    self.active_cat.throw(3)  # 向左丢
                     self.add_debug_message(f"互动: 将猫丢向左方")
                 elif event.key == pygame.K_e:
                     # 放下猫
-                    self.cat.is_picked_up = False
-                    self.cat.x = self.player.x
-                    self.cat.y = self.player.y
+                    self.active_cat.is_picked_up = False
+                    self.active_cat.x = self.player.x
+                    self.active_cat.y = self.player.y
                     self.add_debug_message(f"互动: 放下了猫")
                 return
             if event.key == pygame.K_ESCAPE:
@@ -450,7 +574,7 @@ class Game:
                         self.add_debug_message(f"钓鱼: 开始钓鱼...")
                     else:
                         # 如果不能钓鱼，尝试其他交互
-                        interact_result = self.player.interact(self.world, self.cat)
+                        interact_result = self.player.interact(self.world, self.active_cat)
                         # 处理交互结果
                         if isinstance(interact_result, tuple):
                             # 返回了(True/False, 交互类型)
@@ -494,15 +618,19 @@ class Game:
                 self.ui.toggle_inventory()
             # Movement
             elif event.key == pygame.K_w:
+                self.player.stop_route()
                 self.player.move(0, -1, self.world)
                 self.add_debug_message(f"玩家位置: ({self.player.x}, {self.player.y})")
             elif event.key == pygame.K_s:
+                self.player.stop_route()
                 self.player.move(0, 1, self.world)
                 self.add_debug_message(f"玩家位置: ({self.player.x}, {self.player.y})")
             elif event.key == pygame.K_a:
+                self.player.stop_route()
                 self.player.move(-1, 0, self.world)
                 self.add_debug_message(f"玩家位置: ({self.player.x}, {self.player.y})")
             elif event.key == pygame.K_d:
+                self.player.stop_route()
                 self.player.move(1, 0, self.world)
                 self.add_debug_message(f"玩家位置: ({self.player.x}, {self.player.y})")
             elif event.key == pygame.K_RETURN:
@@ -513,5 +641,15 @@ class Game:
                     self.add_debug_message(f"睡眠: 进入下一天")
 
 if __name__ == "__main__":
-    game = Game()
-    game.run() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="猫咪小镇 ASCII Prototype")
+    parser.add_argument("--headless", action="store_true", help="不开窗口，只跑模拟（CI/平衡性测试用）")
+    parser.add_argument("--days", type=int, default=1, help="无头模式下模拟的天数")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子（世界生成和随机事件）")
+    parser.add_argument("--batch", action="store_true", help="无头模式下跳过逐帧循环，直接批量推进天数")
+    args = parser.parse_args()
+    
+    if args.headless:
+        run_headless(args.days, args.seed, args.batch)
+    else:
+        game = Game()
+        game.run() 
\ No newline at end of file